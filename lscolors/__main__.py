@@ -1,6 +1,21 @@
 """Enable running with `python -m`."""
 
-from lscolors.cli import main
+import sys
+
+from lscolors.commands.utils.shellenv import fast_main
+
+
+def main(args: list[str] | None = None) -> None:
+    """Command line interface entry point; `env` from the cache, else `cli.main`."""
+
+    if fast_main(sys.argv[1:] if args is None else args):
+        return
+
+    # imported here, so `fast_main` does not wait for the parser's modules.
+    from lscolors.cli import main as cli_main  # noqa: PLC0415
+
+    cli_main(args)
+
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,11 @@
 import lscolors.commands.utils.colors as colors_utils
 import lscolors.commands.utils.config as config_utils
 from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils.database import FILETYPE, ColorDatabase, Entry
+from lscolors.commands.utils.suffixes import case_rules, case_variants, fold
+
+# `case_rules` -> how `ls` matches the suffix.
+_RULES = {True: "any case", False: "exact case", None: "superseded"}
 
 
 class LscolorsCheckCmd(LscolorsCmd):
@@ -15,7 +20,22 @@ class LscolorsCheckCmd(LscolorsCmd):
             "check",
             help="check database for required items",
             description="Check database in `$LS_COLORS` for required items.",
-            epilog="Exit Status: zero indicates success, nonzero indicates failure.",
+            epilog=(
+                "With `-v`, print the `FILE:LINE` each required item is defined at. "
+                "With `-v` or `--ignore-case`, extensions and patterns that differ "
+                "only in case are listed, with how `ls` of coreutils 9.2 and later "
+                "matches each. "
+                "Exit Status: zero indicates success, nonzero indicates failure."
+            ),
+        )
+
+        parser.add_argument(
+            "--ignore-case",
+            action="store_true",
+            help=(
+                "accept required extensions and patterns in any case, where "
+                "`ls` of coreutils 9.2 and later would match them"
+            ),
         )
 
         self.add_config_option(parser)
@@ -39,11 +59,22 @@ class LscolorsCheckCmd(LscolorsCmd):
             + config["required_extensions"]
         )
         nrequired = len(required)
+
+        # k=folded key, v=entry matched in any case.
+        folded: dict[str, Entry] = {}
+        if self.options.verbose or self.options.ignore_case:
+            rules = _case_rules(colors)
+            self._print_case_variants(colors, rules)
+            if self.options.ignore_case:
+                folded = {fold(x.key): x for x, rule in rules if rule}
+
         # missing = [x for x in required if x not in colors]
         missing = []
         for item in required:
-            if item not in colors:
+            if (entry := colors.entry(item) or folded.get(fold(item))) is None:
                 missing.append(item)
+            elif self.options.verbose:
+                print(f"{entry.where}: {item}={entry.color} {entry.comment.strip()}".rstrip())
 
         if (nmissing := len(missing)) > 0:
             raise RuntimeError(
@@ -58,3 +89,24 @@ class LscolorsCheckCmd(LscolorsCmd):
             f"{nrequired}/{nrequired} required.\n"
             f"{self.options.prog}: {meta_colors}; {meta_config}"
         )
+
+    def _print_case_variants(
+        self, colors: ColorDatabase, rules: list[tuple[Entry, bool | None]]
+    ) -> None:
+        """Print extensions and patterns of `colors` that differ only in case."""
+
+        rule_by_key = {x.key: rule for x, rule in rules}
+        for group in case_variants([x.key for x, _ in rules]):
+            variants = ", ".join([f"{x}={colors[x]} ({_RULES[rule_by_key[x]]})" for x in group])
+            print(f"{self.options.prog}: case variants; {variants}")
+
+
+def _case_rules(colors: ColorDatabase) -> list[tuple[Entry, bool | None]]:
+    """Return extensions and patterns of `colors`, each with how `ls` matches its case.
+
+    Per `case_rules`: True if in any case, False if exact case, None if superseded.
+    """
+
+    patterns = [x for x in colors.entries() if x.kind != FILETYPE]
+    rules = case_rules([(x.key.removeprefix("*"), x.color) for x in patterns])
+    return list(zip(patterns, rules, strict=True))
@@ -0,0 +1,167 @@
+"""lscolors `classify` command."""
+
+import os
+import stat
+import sys
+from collections.abc import Callable, Iterator
+from typing import BinaryIO
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.classify import Classifier, FileInfo
+from lscolors.commands.utils.prefetch import Prefetcher
+
+# bytes read from `stdin`, and written to `stdout`, at a time.
+_BUFSIZE = 1 << 20
+
+
+class LscolorsClassifyCmd(LscolorsCmd):
+    """lscolors `classify` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `classify` command."""
+
+        parser = self.add_subcommand_parser(
+            "classify",
+            help="color paths read from stdin",
+            description=self.cli.dedent("""
+                Filter NUL-terminated paths on `stdin` to `stdout`, each
+                colored as `ls` colors it with the database in `$LS_COLORS`;
+                e.g., `find -print0 | lscolors classify`, or `git ls-files -z
+                | lscolors classify --sgr`.
+
+                Paths are streamed, never held all in memory. Files are
+                stat'ed only when the database colors more than names; when
+                it colors only `fi`, extensions and patterns, every path is
+                colored as a plain file, found or not.
+
+                On network filesystems, such as NFS and sshfs, stat files
+                with `--workers` threads, to have many in flight at once.
+                Paths are written in input order, and at most `--queue-depth`
+                are stat'ed ahead of being written, so memory stays flat.
+
+                Symbolic links are resolved one link at a time, each read once
+                however many chains lead through it.
+
+                With `-vv`, statistics of the cache of matched names, and the
+                number of symbolic links read, are printed to `stderr`.
+                """),
+        )
+
+        parser.add_argument(
+            "--sgr",
+            action="store_true",
+            help="write `PATH<TAB>SGR` records, with empty `SGR` if uncolored",
+        )
+
+        parser.add_argument(
+            "-z",
+            "--zero",
+            action="store_true",
+            help="terminate records with NUL, not newline",
+        )
+
+        arg = parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            metavar="N",
+            help="stat files in `N` threads; e.g., 32 on network filesystems",
+        )
+        self.cli.add_default_to_help(arg)
+
+        parser.add_argument(
+            "--queue-depth",
+            type=int,
+            metavar="N",
+            help="keep at most `N` files being stat'ed ahead of output (default: 4 per worker)",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, _ = colors_utils.load(self.options)
+        except RuntimeError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        classifier = Classifier(colors)
+        probe: Callable[[str], FileInfo]
+        if classifier.needs_stat:
+            probe = classifier.probe
+            workers = self.options.workers
+        else:
+            probe = _plain
+            workers = 1
+        end = b"\0" if self.options.zero else b"\n"
+        # k=color, v=(bytes before path, bytes after path).
+        wrappers: dict[str | None, tuple[bytes, bytes]] = {}
+        output = sys.stdout.buffer
+        count = 0
+
+        try:
+            prefetcher = Prefetcher(workers, self.options.queue_depth)
+        except ValueError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        try:
+            with prefetcher:
+                for paths in _read_paths(sys.stdin.buffer):
+                    out = bytearray()
+                    infos = prefetcher.map(probe, [os.fsdecode(x) for x in paths])
+                    for path, info in zip(paths, infos, strict=True):
+                        color = classifier.color(info)
+                        if (wrapper := wrappers.get(color)) is None:
+                            wrapper = wrappers[color] = self._wrapper(color, end)
+                        out += wrapper[0]
+                        out += path
+                        out += wrapper[1]
+                    output.write(out)
+                    count += len(paths)
+            output.flush()
+        except BrokenPipeError:
+            # the reader went away, as `head` does; stop quietly, as a filter should.
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, output.fileno())
+            sys.exit(1)
+
+        if self.options.verbose > 1:
+            print(
+                f"{self.options.prog}: {count} paths; {classifier.cache.stats()}; "
+                f"{classifier.links.readlinks} symbolic links read",
+                file=sys.stderr,
+            )
+
+    def _wrapper(self, color: str | None, end: bytes) -> tuple[bytes, bytes]:
+        """Return bytes to write before and after a path of `color`."""
+
+        sgr = (color or "").encode()
+        if self.options.sgr:
+            return b"", b"\t" + sgr + end
+        if not sgr:
+            return b"", end
+        return b"\x1b[" + sgr + b"m", b"\x1b[0m" + end
+
+
+def _plain(name: str) -> FileInfo:
+    """Return info of file `name`, taken as a plain file without stat'ing it."""
+    return FileInfo(name, stat.S_IFREG, stat_ok=False)
+
+
+def _read_paths(file: BinaryIO) -> Iterator[list[bytes]]:
+    """Yield lists of the NUL-terminated paths read from `file`, a buffer at a time.
+
+    Empty paths are skipped; the last path need not be terminated.
+    """
+
+    # `read1` returns what is available, not waiting to fill the buffer from a pipe.
+    read = getattr(file, "read1", file.read)
+    rest = b""
+    while data := read(_BUFSIZE):
+        *paths, rest = (rest + data).split(b"\0")
+        if paths := [x for x in paths if x]:
+            yield paths
+    if rest:
+        yield [rest]
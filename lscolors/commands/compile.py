@@ -0,0 +1,47 @@
+"""lscolors `compile` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import compiled
+
+
+class LscolorsCompileCmd(LscolorsCmd):
+    """lscolors `compile` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `compile` command."""
+
+        parser = self.add_subcommand_parser(
+            "compile",
+            help="write database to a memory-mappable file",
+            description=self.cli.dedent(f"""
+                Write the database in `$LS_COLORS`, as compiled for this
+                terminal, to a binary file that is read through `mmap`,
+                without parsing; e.g., `lscolors compile -o colors.db
+                ~/.dircolors`, then `lscolors report
+                {colors_utils.COMPILED_PREFIX}colors.db`.
+
+                Lookups read only the entries they need, and processes
+                reading the same file share one copy. The file is replaced
+                atomically.
+                """),
+        )
+
+        parser.add_argument(
+            "-o",
+            "--output",
+            required=True,
+            metavar="FILE",
+            help="write to `FILE`",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, _ = colors_utils.load(self.options)
+            compiled.write(self.options.output, colors)
+        except (RuntimeError, OSError) as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
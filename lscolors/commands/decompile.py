@@ -0,0 +1,39 @@
+"""lscolors `decompile` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.paint import ColorGroup
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.decompile import decompile
+
+
+class LscolorsDecompileCmd(LscolorsCmd):
+    """lscolors `decompile` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `decompile` command."""
+
+        parser = self.add_subcommand_parser(
+            "decompile",
+            help="print database as a `DIR_COLORS` file",
+            description=self.cli.dedent("""
+                Print the database in `$LS_COLORS` as a `dir_colors(5)` file.
+
+                Filetypes are written with their canonical keywords, and
+                extensions are grouped by color under the group comments
+                that `paint` recognizes.
+                """),
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, meta_colors = colors_utils.load(self.options)
+        except RuntimeError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        title = f"Decompiled by lscolors from {meta_colors}."
+        for line in decompile(colors, title, ColorGroup.comments()):
+            print(line)
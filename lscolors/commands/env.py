@@ -0,0 +1,91 @@
+"""lscolors `env` command."""
+
+import os
+import sys
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import cache, default_database, server, shellenv
+from lscolors.commands.utils import colors as colors_utils
+
+
+class LscolorsEnvCmd(LscolorsCmd):
+    """lscolors `env` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `env` command."""
+
+        parser = self.add_subcommand_parser(
+            "env",
+            help="print shell commands to set `$LS_COLORS`",
+            description=self.cli.dedent(f"""
+                Print shell commands to set `$LS_COLORS`, like `dircolors(1)`;
+                e.g., `eval "$(lscolors env ~/.dircolors)"`. `DIR_COLORS`
+                defaults to `{default_database.NAME}`.
+
+                The output is cached, and printed straight from the cache,
+                without parsing anything, while `DIR_COLORS` is unchanged. Else,
+                the database is taken from `lscolors serve`, if it is running;
+                its answers are not cached.
+                """),
+        )
+
+        arg = parser.add_argument(
+            "--shell",
+            choices=shellenv.SHELLS,
+            default=shellenv.default_shell(),
+            help="print commands for `SHELL`",
+        )
+        self.cli.add_default_to_help(arg)
+
+        parser.add_argument(
+            "--term",
+            help="compile for terminal type `TERM`; default `$TERM`",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        if self.options.term:
+            os.environ["TERM"] = self.options.term
+        if not self.options.dir_colors and not self.options.theme:
+            self.options.dir_colors = [default_database.NAME]
+
+        ls_colors = self._query_server()
+        from_server = ls_colors is not None
+        if ls_colors is None:
+            try:
+                colors, _ = colors_utils.load(self.options, allow_empty=True)
+            except RuntimeError as err:
+                raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+            ls_colors = colors.to_ls_colors()
+
+        output = shellenv.format_env(self.options.shell, "LS_COLORS", ls_colors)
+        sys.stdout.write(output)
+
+        if self.options.no_cache or self.options.lenient or self.options.theme or from_server:
+            # the daemon's answer may predate the files the key is stamped from.
+            return
+        key = shellenv.env_key(
+            self.options.dir_colors,
+            self.options.shell,
+            os.environ.get("TERM") or "none",
+            os.environ.get("COLORTERM", ""),
+        )
+        if key:
+            cache.put(key, output)
+
+    def _query_server(self) -> str | None:
+        """Return `$LS_COLORS` compiled by `lscolors serve`, or None."""
+
+        if self.options.no_cache or self.options.lenient or self.options.theme:
+            return None
+        if (sources := server.client_sources(self.options.dir_colors)) is None:
+            return None
+        return server.query(
+            "ls_colors",
+            os.environ.get("TERM") or "none",
+            os.environ.get("COLORTERM", ""),
+            *sources,
+        )
@@ -0,0 +1,48 @@
+"""lscolors `export` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import export as export_utils
+
+
+class LscolorsExportCmd(LscolorsCmd):
+    """lscolors `export` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `export` command."""
+
+        parser = self.add_subcommand_parser(
+            "export",
+            help="print database for other programs",
+            description=self.cli.dedent("""
+                Print `sh` commands that give the database in `$LS_COLORS`
+                to other programs: `$LS_COLORS` for GNU `ls` and `fd`,
+                `$LSCOLORS` for BSD `ls`, `$EXA_COLORS` for `exa` and `eza`,
+                `$TREE_COLORS` for `tree`, and the `list-colors` style for
+                zsh completion.
+                """),
+            epilog="Results are cached with the compiled database.",
+        )
+
+        parser.add_argument(
+            "--format",
+            nargs="+",
+            choices=export_utils.FORMATS,
+            default=export_utils.FORMATS,
+            metavar="FORMAT",
+            help=f"export to `FORMAT`, one of {', '.join(export_utils.FORMATS)}; default all",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, _ = colors_utils.load(self.options)
+        except RuntimeError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        exported = export_utils.export(colors, tuple(self.options.format), self.options.no_cache)
+        for line in export_utils.shell_lines(exported):
+            print(line)
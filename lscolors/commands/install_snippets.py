@@ -0,0 +1,74 @@
+"""lscolors `install-snippets` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import cache, default_database, shellenv, snippets
+
+
+class LscolorsInstallSnippetsCmd(LscolorsCmd):
+    """lscolors `install-snippets` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `install-snippets` command."""
+
+        parser = self.add_subcommand_parser(
+            "install-snippets",
+            help="write shell snippets setting `$LS_COLORS` for each terminal",
+            description=self.cli.dedent(f"""
+                Write a shell snippet setting `$LS_COLORS` for each terminal
+                type named by the `TERM` lines of `DIR_COLORS`, and by `--term`;
+                e.g., `xterm-256color.sh`. `DIR_COLORS` defaults to
+                `{default_database.NAME}`.
+
+                Shell startup then sources the snippet for its terminal, without
+                running anything; e.g., `. ~/.cache/lscolors/$TERM.sh`.
+
+                Snippets are replaced atomically, and only when they change, so
+                this is cheap to run whenever `DIR_COLORS` may have changed.
+                Each written snippet is printed.
+                """),
+        )
+
+        parser.add_argument(
+            "--term",
+            nargs="+",
+            default=[],
+            help="also write snippets for terminal types `TERM`",
+        )
+
+        arg = parser.add_argument(
+            "--shell",
+            nargs="+",
+            choices=shellenv.SHELLS,
+            default=[shellenv.default_shell()],
+            metavar="SHELL",
+            help=f"write snippets for `SHELL`, one of {', '.join(shellenv.SHELLS)}",
+        )
+        self.cli.add_default_to_help(arg)
+
+        parser.add_argument(
+            "--dir",
+            metavar="DIR",
+            help="write snippets into `DIR`; default the cache directory",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        if not self.options.dir_colors and not self.options.theme:
+            self.options.dir_colors = [default_database.NAME]
+        if "-" in self.options.dir_colors:
+            raise RuntimeError(f"{self.options.prog}: failure; cannot read `stdin` per terminal")
+
+        try:
+            terms = snippets.terms(self.options)
+            terms += [x for x in self.options.term if x not in terms]
+            written = snippets.install(
+                self.options, terms, self.options.shell, self.options.dir or cache.cache_dir()
+            )
+        except (RuntimeError, OSError) as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        for path in written:
+            print(path)
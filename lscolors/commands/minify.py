@@ -0,0 +1,48 @@
+"""lscolors `minify` command."""
+
+import sys
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import minify as minify_utils
+
+
+class LscolorsMinifyCmd(LscolorsCmd):
+    """lscolors `minify` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `minify` command."""
+
+        parser = self.add_subcommand_parser(
+            "minify",
+            help="print smallest equivalent `$LS_COLORS`",
+            description=self.cli.dedent("""
+                Print the smallest value for `$LS_COLORS` that colors files
+                the same as the database in `$LS_COLORS`.
+
+                SGR parameters are canonicalized; e.g., `00;01;034` becomes
+                `1;34`, and entries that select the color `ls` uses anyway,
+                such as `di=01;34`, are dropped.
+                """),
+            epilog="With `-v`, print the sizes before and after to `stderr`.",
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, meta_colors = colors_utils.load(self.options)
+        except RuntimeError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        ls_colors = minify_utils.minify(colors)
+        print(ls_colors)
+
+        if self.options.verbose:
+            before = len(colors.to_ls_colors())
+            print(
+                f"{self.options.prog}: {meta_colors}; {before} -> {len(ls_colors)} characters",
+                file=sys.stderr,
+            )
@@ -10,6 +10,7 @@ from typing import Iterable
 from colors.colors import parse_rgb  # type: ignore
 
 from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import default_database
 
 
 class ColorGroup:
@@ -36,6 +37,11 @@ class ColorGroup:
         """Return ColorGroup with matching `comment`."""
         return cls._group_by_comment.get(comment, default)
 
+    @classmethod
+    def comments(cls) -> list[str]:
+        """Return comments of ColorGroup's, in insertion order."""
+        return list(cls._group_by_comment)
+
     @classmethod
     def items(cls) -> Iterable[ColorGroup]:
         """Return list of ColorGroup's in insertion order."""
@@ -144,6 +150,10 @@ class LscolorsPaintCmd(LscolorsCmd):
             "paint",
             help="paint dircolors",
             description="Apply palette to dircolors.",
+            epilog=(
+                "With `-v`, print the `FILE:LINE`, keyword and group of each "
+                "repainted line to `stderr`."
+            ),
         )
 
         arg = parser.add_argument(
@@ -152,7 +162,10 @@ class LscolorsPaintCmd(LscolorsCmd):
             metavar="DIR_COLORS",
             type=Path,
             default=Path.home() / ".dircolors",
-            help="read `DIR_COLORS` file",
+            help=(
+                f"read `DIR_COLORS` file; `{default_database.NAME}`, or if the default "
+                "does not exist, the `dircolors --print-database` database"
+            ),
         )
         self.cli.add_default_to_help(arg)
 
@@ -242,7 +255,7 @@ class LscolorsPaintCmd(LscolorsCmd):
 
         group_color = None
         # print("#", self.options.dir_colors)
-        for line in self.options.dir_colors.read_text(self.options.encoding).splitlines():
+        for lineno, line in enumerate(self._read_dir_colors().splitlines(), start=1):
             rstripped = line.rstrip()
             group_color = ColorGroup.get_by_comment(rstripped, group_color)
 
@@ -260,6 +273,12 @@ class LscolorsPaintCmd(LscolorsCmd):
                 print(rstripped)
                 continue
 
+            if self.options.verbose:
+                print(
+                    f"{self.options.dir_colors}:{lineno}: {keyword} {color.group_name}",
+                    file=sys.stderr,
+                )
+
             parts = [keyword, color.ansi]
             if color.rgb:
                 parts.append("#" + str(color.rgb))
@@ -269,6 +288,18 @@ class LscolorsPaintCmd(LscolorsCmd):
 
     # -------------------------------------------------------------------------------
 
+    def _read_dir_colors(self) -> str:
+        """Return text of `DIR_COLORS` file, or of the default database."""
+
+        path = self.options.dir_colors
+        if str(path) == default_database.NAME or (
+            path == self.parser.get_default("dir_colors") and not path.exists()
+        ):
+            return default_database.SOURCE
+        return str(path.read_text(self.options.encoding))
+
+    # -------------------------------------------------------------------------------
+
     def _load_palette(self) -> None:
         rgb_colors = self._read_palette()
         _len_rgb_colors = len(list(rgb_colors))
@@ -0,0 +1,52 @@
+"""lscolors `plan` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.classify import NAMED, Classifier
+from lscolors.commands.utils.minify import LS_DEFAULTS
+
+
+class LscolorsPlanCmd(LscolorsCmd):
+    """lscolors `plan` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `plan` command."""
+
+        parser = self.add_subcommand_parser(
+            "plan",
+            help="report system calls coloring files needs",
+            description=self.cli.dedent(f"""
+                Report the system calls that coloring files with the database
+                in `$LS_COLORS` needs, beyond reading directories, and the
+                entries that need them; as `ls`, no others are made.
+
+                Each line is `CALL: KEY=COLOR [FILE:LINE]`, or `[ls default]`
+                for colors `ls` uses when the database has none. On slow
+                filesystems, such as NFS and sshfs, set those entries to
+                `00` to avoid the calls; e.g., `EXEC 00`, or `ex=00`.
+
+                `{NAMED}` applies to paths named one by one, as to
+                `lscolors classify`; entries read from directories know their
+                filetype without it.
+                """),
+        )
+
+        self.add_colors_argument(parser)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            colors, _ = colors_utils.load(self.options)
+        except RuntimeError as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
+
+        plan = Classifier(colors).plan
+        if not plan.reasons:
+            print("none")
+        for call, codes in plan.reasons.items():
+            for code in codes:
+                if (entry := colors.entry(code)) is None:
+                    print(f"{call}: {code}={LS_DEFAULTS[code]} [ls default]")
+                else:
+                    print(f"{call}: {code}={entry.color} [{entry.where}]")
@@ -2,6 +2,8 @@
 
 from lscolors.cmd import LscolorsCmd
 from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import dircolors
+from lscolors.commands.utils.database import Entry
 
 
 class LscolorsReportCmd(LscolorsCmd):
@@ -14,7 +16,11 @@ class LscolorsReportCmd(LscolorsCmd):
             "report",
             help="print colorized database report",
             description="Print colorized report for database in `$LS_COLORS`.",
-            epilog="A default format is produced when `--left/--right` is not given.",
+            epilog=(
+                "A default format is produced when `--left/--right` is not given. "
+                "With `-v`, each line ends with the `FILE:LINE` and group comment "
+                "the entry was defined at."
+            ),
         )
 
         grp = parser.add_mutually_exclusive_group()
@@ -30,29 +36,6 @@ class LscolorsReportCmd(LscolorsCmd):
     def run(self) -> None:
         """Perform the command."""
 
-        codes = {
-            "no": ("NORMAL", "- Normal (nonfilename) text"),
-            "fi": ("FILE", "- Regular File"),
-            "di": ("DIR", "- Directory"),
-            "ln": ("LINK", "- Symbolic Link"),
-            "pi": ("FIFO", "- Named Pipe"),
-            "so": ("SOCK", "- Unix Domain Socket"),
-            "do": ("DOOR", "- Door"),
-            "bd": ("BLK", "- Block Device"),
-            "cd": ("CHR", "- Character Device"),
-            "or": ("ORPHAN", "- Orphaned Symbolic Link"),
-            "mi": ("MISSING", "- Missing File"),
-            "su": ("SETUID", "- Set User ID"),
-            "sg": ("SETGID", "- Set Group ID"),
-            "tw": ("STICKY_OTHER_WRITABLE", ""),
-            "ow": ("OTHER_WRITABLE", "- Other Writable"),
-            "st": ("STICKY", "- Sticky"),
-            "ex": ("EXEC", "- Executable"),
-            "rs": ("RESET", "- Reset to NORMAL"),
-            "mh": ("MULTIHARDLINK", "- Multiple Hard Links"),
-            "ca": ("CAPABILITY", ""),
-        }
-
         try:
             colors, meta_colors = colors_utils.load(self.options)
         except RuntimeError as err:
@@ -60,27 +43,36 @@ class LscolorsReportCmd(LscolorsCmd):
 
         print(f"{self.options.prog} for {meta_colors}:")
 
-        for filetype, color in colors.items():
+        for entry in colors.entries():
+            filetype, color = entry.key, entry.color
             type_color = f"{filetype:15} {color:20}"
-            _ = codes.get(filetype)
-            # SIM108: two-branch assignment with meaningful names; ternary reduces readability.
-            if _:  # noqa: SIM108
-                text = f"{_[0]} {_[1]}"
-            else:
-                text = filetype + " lorem ipsum dolor sit amet"
+            text = self._text(entry, dircolors.FILETYPES.get(filetype))
 
             scolor = color.ljust(10)
             if self.options.left:
                 if color == "target":
                     print(f"{type_color} {scolor} {text:>44}")
                 else:
-                    print(f"{type_color} \x1b[{color}m{scolor} {text:>44}\x1b[0m")
+                    print(f"{type_color} {entry.escape}{scolor} {text:>44}\x1b[0m")
             elif self.options.right:
                 if color == "target":
                     print(f"{text:44} {type_color}")
                 else:
-                    print(f"\x1b[{color}m{text:44}\x1b[0m {type_color}")
+                    print(f"{entry.escape}{text:44}\x1b[0m {type_color}")
             elif color == "target":
                 print(f"{type_color} {scolor} {text:44}")
             else:
-                print(f"{type_color} \x1b[{color}m{text:44}\x1b[0m")
+                print(f"{type_color} {entry.escape}{text:44}\x1b[0m")
+
+    def _text(self, entry: Entry, code: tuple[str, str] | None) -> str:
+        """Return description of `entry`; with `-v`, followed by where it was defined."""
+
+        # SIM108: two-branch assignment with meaningful names; ternary reduces readability.
+        if code:  # noqa: SIM108
+            text = f"{code[0]} {code[1]}"
+        else:
+            text = entry.key + " lorem ipsum dolor sit amet"
+
+        if self.options.verbose:
+            text = f"{text} [{entry.where}] {entry.comment.strip()}".rstrip()
+        return text
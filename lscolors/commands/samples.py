@@ -8,6 +8,7 @@ from lscolors.cmd import LscolorsCmd
 from lscolors.commands.utils import colors as colors_utils
 from lscolors.commands.utils import config as config_utils
 from lscolors.commands.utils import mkdir
+from lscolors.commands.utils.database import ColorDatabase, format_codes
 
 
 class LscolorsSamplesCmd(LscolorsCmd):
@@ -84,7 +85,7 @@ class LscolorsSamplesCmd(LscolorsCmd):
         os.chdir(path)
         self._samples(colors, config, "x{name}.{color}{name}")
 
-    def _samples(self, colors: dict[str, str], config: dict[str, list[str]], fmt: str) -> None:
+    def _samples(self, colors: ColorDatabase, config: dict[str, list[str]], fmt: str) -> None:
         for name in config["required_filenames"]:
             if name[0] == "*":
                 # PLW2901: name is stripped of its leading '*' wildcard marker.
@@ -274,12 +275,9 @@ class LscolorsSamplesCmd(LscolorsCmd):
         os.symlink(exec_file, self._fname("LINK-symlink-to-exec_file"))
 
     @staticmethod
-    def _create_extension_samples(colors: dict[str, str], fmt: str) -> None:
-        for name in [
-            x
-            for x in colors
-            if x
-            not in [
+    def _create_extension_samples(colors: ColorDatabase, fmt: str) -> None:
+        for entry in colors.entries():
+            if entry.key in [
                 "bd",
                 "ca",
                 "cd",
@@ -298,10 +296,9 @@ class LscolorsSamplesCmd(LscolorsCmd):
                 "st",
                 "su",
                 "tw",
-            ]
-        ]:
-            color = "-".join([f"{int(x):03}" for x in colors[name].split(";")])
-            filename = fmt.format(color=color, name=name)
+            ]:
+                continue
+            filename = fmt.format(color=format_codes(entry.codes), name=entry.key)
             try:
                 os.stat(filename)
             except FileNotFoundError:
@@ -0,0 +1,50 @@
+"""lscolors `serve` command."""
+
+from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils import server
+
+
+class LscolorsServeCmd(LscolorsCmd):
+    """lscolors `serve` command."""
+
+    def init_command(self) -> None:
+        """Initialize lscolors `serve` command."""
+
+        parser = self.add_subcommand_parser(
+            "serve",
+            help="serve compiled databases to other processes",
+            description=self.cli.dedent("""
+                Serve compiled databases over a Unix domain socket, until
+                interrupted or terminated. The socket is `lscolors.sock` in
+                `$XDG_RUNTIME_DIR`, else the cache directory.
+
+                Databases are compiled on first request, and kept in memory;
+                their files are checked on every request, and changed ones
+                recompiled. `lscolors env` asks the daemon, when it is running,
+                and compiles for itself when not.
+
+                Other programs, such as editors and file managers, may ask too,
+                with lines of tab-separated fields: `ls_colors TERM COLORTERM
+                SOURCE...` for `$LS_COLORS`, or `color TERM COLORTERM NAME
+                SOURCE...` for the color of filename `NAME`, where each `SOURCE`
+                is an absolute path of a `dir_colors(5)` file, or
+                `builtin:default`. Responses are `ok VALUE` or `error MESSAGE`.
+                """),
+        )
+
+        arg = parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            metavar="SECONDS",
+            help="drop databases whose files have changed every `SECONDS`",
+        )
+        self.cli.add_default_to_help(arg)
+
+    def run(self) -> None:
+        """Perform the command."""
+
+        try:
+            server.run(server.socket_path(), self.options.interval)
+        except (RuntimeError, OSError) as err:
+            raise RuntimeError(f"{self.options.prog}: failure; {err}\n") from err
@@ -4,6 +4,7 @@ import sys
 from collections import defaultdict
 
 from lscolors.cmd import LscolorsCmd
+from lscolors.commands.utils.database import format_codes, parse_sgr
 
 
 class LscolorsSortCmd(LscolorsCmd):
@@ -49,10 +50,7 @@ class LscolorsSortCmd(LscolorsCmd):
             if (i := arg.find("#")) >= 0:
                 arg = arg[:i].strip()
 
-            colors = []
-            for color in arg.split(";"):
-                colors.append(f"{int(color):03}")
-            color = "-".join(colors)
+            color = format_codes(parse_sgr(arg)[0])
 
             lines_by_color[color].append(line)
 
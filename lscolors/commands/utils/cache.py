@@ -0,0 +1,113 @@
+"""lscolors cache.
+
+Compiled databases are stored under `$XDG_CACHE_HOME/lscolors`, one file
+per key, in `marshal` format. Keys identify the source: a file's path,
+mtime, ctime, size and inode, or a hash of the text, plus anything else the
+compiled result depends on, such as `$TERM`.
+"""
+
+import hashlib
+import marshal
+import os
+from typing import Any
+
+# Bump when the layout of cached values changes.
+_VERSION = 4
+
+
+def cache_dir() -> str:
+    """Return path of cache directory."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "lscolors")
+
+
+def file_key(path: str, *extra: str) -> str:
+    """Return cache key for file `path` and `extra` qualifiers.
+
+    The file is not read; an edit is seen by its stat. The ctime is taken
+    too, as an edit that keeps the size may keep the mtime, on filesystems
+    of coarse timestamps, or when tools such as `touch -r` restore it.
+
+    Raises:
+        OSError: if `path` cannot be stat'ed.
+    """
+
+    st = os.stat(path)
+    return _digest(
+        "file",
+        os.path.abspath(path),
+        str(st.st_mtime_ns),
+        str(st.st_ctime_ns),
+        str(st.st_size),
+        str(st.st_ino),
+        str(st.st_dev),
+        *extra,
+    )
+
+
+def text_key(text: str, *extra: str) -> str:
+    """Return cache key for `text` and `extra` qualifiers."""
+
+    return _digest("text", text, *extra)
+
+
+def combined_key(keys: list[str]) -> str:
+    """Return cache key for the combination of `keys`, in order."""
+
+    return _digest("combined", *keys)
+
+
+def get(key: str) -> Any:
+    """Return value cached under `key`, or None."""
+
+    try:
+        with open(os.path.join(cache_dir(), key), "rb") as file:
+            # one read; `marshal.load` reads a file object a few bytes at a time.
+            version, value = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    return value if version == _VERSION else None
+
+
+def put(key: str, value: Any) -> None:
+    """Cache `value` under `key`; atomically, and silently ignoring errors."""
+
+    try:
+        data = marshal.dumps((_VERSION, value))
+        write_atomic(os.path.join(cache_dir(), key), data)
+    except (OSError, ValueError):
+        pass
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace file `path` with `data` atomically, creating its directory if needed.
+
+    Raises:
+        OSError: if `path` cannot be written; it is left unchanged.
+    """
+
+    # imported here, to keep reading the cache cheap for `lscolors env`.
+    import tempfile  # noqa: PLC0415
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _digest(*parts: str) -> str:
+    """Return hex digest of `parts`."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogateescape"))
+        digest.update(b"\0")
+    return digest.hexdigest()
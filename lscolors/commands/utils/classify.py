@@ -0,0 +1,367 @@
+"""Classify files to color them, as `ls` does.
+
+`probe` gathers what `ls` knows about a file, making the system calls;
+`Classifier.color` applies the precedence of `get_color_indicator` in
+`ls.c` to that, without making any:
+
+    regular files: setuid, setgid, capability, executable, multiple hard
+        links, else an extension or pattern matching the name, else `fi`.
+    directories: sticky and other-writable, other-writable, sticky, else `di`.
+    symbolic links: `or` if the target is missing and `or` is colored,
+        or `ln=target`; else `ln`, or the color of the target for `ln=target`.
+    others: `pi`, `so`, `bd`, `cd`, `do`, else `or`.
+
+Filetypes missing from the database get the colors `ls` uses by default.
+
+As `ls`, only the system calls the database needs are made; see `StatPlan`.
+Entries from `os.scandir` know their filetype from `d_type`, so files
+whose filetype alone decides their color are not stat'ed at all.
+"""
+
+import os
+import stat
+from collections.abc import Iterator, Mapping
+
+from lscolors.commands.utils.links import LinkResolver
+from lscolors.commands.utils.lru import LRUCache
+from lscolors.commands.utils.minify import LS_DEFAULTS
+from lscolors.commands.utils.suffixes import Matcher
+
+# k=`S_IFMT` of other filetypes, v=filetype code.
+_FILETYPES = {
+    stat.S_IFLNK: "ln",
+    stat.S_IFIFO: "pi",
+    stat.S_IFSOCK: "so",
+    stat.S_IFBLK: "bd",
+    stat.S_IFCHR: "cd",
+}
+if stat.S_IFDOOR:
+    _FILETYPES[stat.S_IFDOOR] = "do"
+
+# values of filetypes that select no color; `is_colored` in `ls.c`.
+_UNCOLORED = frozenset(["", "0", "00"])
+
+# any of the execute bits; `S_IXUGO`.
+_EXECUTE = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+# filetype codes that take more than the name to tell from `fi`.
+_MODAL = frozenset(
+    [*_FILETYPES.values(), "di", "or", "su", "sg", "ca", "ex", "mh", "tw", "ow", "st"]
+)
+
+# `StatPlan` system calls.
+NAMED = "lstat named files"
+REGULAR = "lstat regular files"
+CAPABILITY = "getxattr regular files"
+DIRECTORY = "lstat directories"
+TARGET = "stat symlink targets"
+
+# k=system call, v=filetype codes whose colors need it.
+_SYSCALLS = {
+    NAMED: tuple(sorted(_MODAL)),
+    REGULAR: ("su", "sg", "ex", "mh"),
+    CAPABILITY: ("ca",),
+    DIRECTORY: ("tw", "ow", "st"),
+    TARGET: ("ln", "or"),
+}
+
+# cached `Classifier.match` result for names matching nothing.
+_MISSING = object()
+
+
+class FileInfo:
+    """What `ls` knows about a file, to color it."""
+
+    __slots__ = ("name", "mode", "stat_ok", "nlink", "capability", "linkok", "linkmode")
+
+    # Too many arguments; one per field of `struct fileinfo` in `ls.c` that colors use.
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        mode: int,
+        *,
+        stat_ok: bool = True,
+        nlink: int = 1,
+        capability: bool = False,
+        linkok: bool = False,
+        linkmode: int = 0,
+    ) -> None:
+        """Create file info.
+
+        Args:
+            name: name of the file, as matched against extensions and patterns.
+            mode: `st_mode` of the file, not following symbolic links.
+            stat_ok: False if only the filetype bits of `mode` are known,
+                as from `d_type`, or if the file could not be stat'ed.
+            nlink: number of hard links.
+            capability: file has capabilities, if known to be needed.
+            linkok: symbolic link whose target exists.
+            linkmode: `st_mode` of the target, if `linkok`.
+        """
+
+        self.name = name
+        self.mode = mode
+        self.stat_ok = stat_ok
+        self.nlink = nlink
+        self.capability = capability
+        self.linkok = linkok
+        self.linkmode = linkmode
+
+    def __repr__(self) -> str:
+        return f"FileInfo({self.name!r}, {stat.filemode(self.mode)!r})"
+
+
+class StatPlan:
+    """The system calls coloring files needs, for a database.
+
+    Files named by path are lstat'ed for their filetype (`NAMED`); those
+    from `os.scandir` know it from `d_type`. Beyond that, regular files are
+    lstat'ed for their mode and links (`REGULAR`), and checked for
+    capabilities (`CAPABILITY`), directories lstat'ed for their mode
+    (`DIRECTORY`), and the targets of symbolic links stat'ed (`TARGET`),
+    only when some filetype colored needs them. Other files, such as pipes
+    and sockets, are always lstat'ed, as `d_type` is not exposed for them.
+    """
+
+    __slots__ = ("reasons",)
+
+    def __init__(self, colored: frozenset[str], referent: bool) -> None:
+        """Create plan for the filetype codes `colored`, and `ln=target` if `referent`."""
+
+        # k=system call, v=filetype codes colored that need it.
+        self.reasons: dict[str, list[str]] = {}
+        for call, codes in _SYSCALLS.items():
+            found = [x for x in codes if x in colored]
+            if call == TARGET and not referent:
+                # `ln` needs its target only for `ln=target`.
+                found = [x for x in found if x != "ln"]
+            if found:
+                self.reasons[call] = found
+
+    def __contains__(self, call: object) -> bool:
+        return call in self.reasons
+
+    def __repr__(self) -> str:
+        return f"StatPlan({self.reasons!r})"
+
+
+class Classifier:
+    """Colors files, as `ls` does for a database.
+
+    Filetype colors are looked up directly, and extension and pattern colors
+    with a `Matcher`, so the cost does not grow with the size of the database.
+    """
+
+    def __init__(
+        self,
+        colors: Mapping[str, str],
+        ignore_case: bool = True,
+        globs: bool = False,
+        cache_size: int = 4096,
+    ) -> None:
+        """Create classifier for database `colors`, keyed as loaded by `colors.load`.
+
+        With `ignore_case`, match extensions and patterns as `ls` of coreutils
+        9.2 and later does, ignoring case unless listed in several cases with
+        different colors; else match them exactly, as before coreutils 9.0.
+        With `globs`, match patterns such as `*README*` as globs, as `eza`
+        does, rather than literally.
+
+        Matches are cached by basename, in an `LRUCache` of `cache_size`
+        names; real trees repeat names such as `__init__.py` and `Makefile`.
+        """
+
+        # k=filetype code, v=color; `color_indicator` in `ls.c`.
+        self._indicators = dict(LS_DEFAULTS)
+        suffixes = []
+        for key, color in colors.items():
+            if key[0] in ".*":
+                suffixes.append((key, color, color))
+            else:
+                self._indicators[key] = color
+        self._suffixes = Matcher(suffixes, ignore_case, globs)
+        self.cache = LRUCache(cache_size)
+        self._colored = frozenset(
+            [key for key, color in self._indicators.items() if color not in _UNCOLORED]
+        )
+        # `color_symlink_as_referent` in `ls.c`.
+        self.referent = self._indicators.get("ln") == "target"
+        self.plan = StatPlan(self._colored, self.referent)
+        self.links = LinkResolver()
+
+    def is_colored(self, code: str) -> bool:
+        """Return True if filetype `code` selects a color."""
+        return code in self._colored
+
+    @property
+    def needs_stat(self) -> bool:
+        """Return True if files must be stat'ed; else every file is colored as `fi`."""
+        return NAMED in self.plan
+
+    @property
+    def needs_capability(self) -> bool:
+        """Return True if regular files must be checked for capabilities."""
+        return CAPABILITY in self.plan
+
+    @property
+    def needs_target(self) -> bool:
+        """Return True if the targets of symbolic links must be stat'ed."""
+        return TARGET in self.plan
+
+    def match(self, name: str) -> str | None:
+        """Return color of the extension or pattern matching `name`, or None.
+
+        As `ls`, the last defined of those `name` ends with. Only regular
+        files are matched, so their basename is all that decides the match.
+        """
+
+        basename = name.rpartition(os.sep)[2]
+        color: str | None = self.cache.get(basename, _MISSING)
+        if color is _MISSING:
+            color = self._suffixes.match(basename)
+            self.cache.put(basename, color)
+        return color
+
+    def filetype(self, info: FileInfo) -> str:
+        """Return filetype code `ls` colors `info` with, before matching extensions."""
+
+        mode = info.linkmode if self.referent and info.linkok else info.mode
+        fmt = stat.S_IFMT(mode)
+        if fmt == stat.S_IFREG:
+            return self._regular(info, mode) if info.stat_ok else "fi"
+        if fmt == stat.S_IFDIR:
+            return self._directory(mode) if info.stat_ok else "di"
+
+        code = _FILETYPES.get(fmt, "or")
+        if code == "ln" and not info.linkok and (self.referent or "or" in self._colored):
+            return "or"
+        return code
+
+    def _regular(self, info: FileInfo, mode: int) -> str:
+        """Return filetype code of regular file `info` with `mode`."""
+
+        colored = self._colored
+        if mode & stat.S_ISUID and "su" in colored:
+            return "su"
+        if mode & stat.S_ISGID and "sg" in colored:
+            return "sg"
+        if info.capability and "ca" in colored:
+            return "ca"
+        if mode & _EXECUTE and "ex" in colored:
+            return "ex"
+        if info.nlink > 1 and "mh" in colored:
+            return "mh"
+        return "fi"
+
+    def _directory(self, mode: int) -> str:
+        """Return filetype code of directory with `mode`."""
+
+        colored = self._colored
+        sticky = mode & stat.S_ISVTX
+        writable = mode & stat.S_IWOTH
+        if sticky and writable and "tw" in colored:
+            return "tw"
+        if writable and "ow" in colored:
+            return "ow"
+        if sticky and "st" in colored:
+            return "st"
+        return "di"
+
+    def color(self, info: FileInfo) -> str | None:
+        """Return color `ls` gives the file of `info`, or None if uncolored."""
+
+        code = self.filetype(info)
+        if code == "fi" and (color := self.match(info.name)) is not None:
+            return color
+        return self._indicators.get(code)
+
+    def probe(
+        self, path: "str | os.DirEntry[str]", st: os.stat_result | None = None
+    ) -> FileInfo:
+        """Return what `ls` knows about file `path`, with the system calls this needs.
+
+        Args:
+            path: name of the file, or directory entry from `os.scandir`.
+            st: result of `os.lstat(path)`, if already known.
+        """
+
+        name = path if isinstance(path, str) else path.path
+        if st is None and not isinstance(path, str) and (info := self._d_type(path)):
+            return info
+        try:
+            if st is None:
+                st = (
+                    os.lstat(path) if isinstance(path, str) else path.stat(follow_symlinks=False)
+                )
+        except OSError:
+            # `ls` colors files it cannot stat as orphans.
+            return FileInfo(name, 0, stat_ok=False)
+
+        info = FileInfo(name, st.st_mode, nlink=st.st_nlink)
+        fmt = stat.S_IFMT(st.st_mode)
+        if fmt == stat.S_IFLNK and self.needs_target:
+            if (target := self.links.target(name, st)) is not None:
+                info.linkok = True
+                info.linkmode = target.st_mode
+        elif fmt == stat.S_IFREG and self.needs_capability:
+            info.capability = _has_capability(name)
+        return info
+
+    def _d_type(self, entry: "os.DirEntry[str]") -> FileInfo | None:
+        """Return info of `entry`, if its filetype is all the plan needs; else None."""
+
+        plan = self.plan
+        try:
+            if entry.is_symlink():
+                mode, needed = stat.S_IFLNK, TARGET in plan
+            elif entry.is_dir(follow_symlinks=False):
+                mode, needed = stat.S_IFDIR, DIRECTORY in plan
+            elif entry.is_file(follow_symlinks=False):
+                mode, needed = stat.S_IFREG, REGULAR in plan or CAPABILITY in plan
+            else:
+                # pipes, sockets and devices; `os.DirEntry` does not tell them apart.
+                return None
+        except OSError:
+            # `d_type` unknown, and the file cannot be stat'ed.
+            return None
+        return None if needed else FileInfo(entry.path, mode, stat_ok=False)
+
+    def walk(self, top: str) -> Iterator[tuple[str, str | None]]:
+        """Yield `(path, color)` of each file under directory `top`, top-down.
+
+        Directories are read with `os.scandir`; see `StatPlan`. Directories
+        that cannot be read are skipped, and symbolic links not followed.
+        The targets of links are resolved afresh; see `LinkResolver`.
+        """
+
+        self.links.clear()
+        yield from self._walk(top)
+
+    def _walk(self, top: str) -> Iterator[tuple[str, str | None]]:
+        """Yield `(path, color)` of each file under directory `top`; see `walk`."""
+
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            yield entry.path, self.classify(entry)
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(entry.path)
+
+    def classify(
+        self, path: "str | os.DirEntry[str]", st: os.stat_result | None = None
+    ) -> str | None:
+        """Return color `ls` gives file `path`, or None; see `probe`."""
+        return self.color(self.probe(path, st))
+
+
+def _has_capability(path: str) -> bool:
+    """Return True if file `path` has capabilities."""
+
+    try:
+        return bool(os.getxattr(path, "security.capability", follow_symlinks=False))
+    except (OSError, AttributeError):
+        # not set, or not supported.
+        return False
@@ -1,78 +1,479 @@
 """lscolors database."""
 
+import contextlib
+import functools
 import os
-import subprocess
+import re
 import sys
 from argparse import ArgumentParser, Namespace
+from typing import TYPE_CHECKING, Iterator
 
-from libcli import BaseCLI
+from lscolors.commands.utils import cache, compiled, default_database, dircolors
+from lscolors.commands.utils import theme as theme_utils
+from lscolors.commands.utils.database import ColorDatabase
 
+if TYPE_CHECKING:
+    # not imported at runtime, to keep `lscolors env` from loading `libcli`.
+    from libcli import BaseCLI
 
-def add_colors_argument(cli: BaseCLI, parser: ArgumentParser) -> None:
+# `indicator_name` in `ls.c`.
+FILETYPE_CODES = frozenset(
+    [
+        "lc",
+        "rc",
+        "ec",
+        "rs",
+        "no",
+        "fi",
+        "di",
+        "ln",
+        "pi",
+        "so",
+        "bd",
+        "cd",
+        "mi",
+        "or",
+        "ex",
+        "do",
+        "su",
+        "sg",
+        "st",
+        "ow",
+        "tw",
+        "ca",
+        "mh",
+        "cl",
+    ]
+)
+
+# these take escape sequences, not SGR parameters.
+ESCAPE_CODES = frozenset(["lc", "rc", "ec", "cl"])
+
+# SGR parameters; e.g., `01;34`.
+RE_SGR = re.compile(r"[0-9;]*")
+
+# `DIR_COLORS` source naming `$LS_COLORS`.
+ENV_SOURCE = "env:LS_COLORS"
+
+# sources whose diagnostics do not name the source.
+_UNNAMED_SOURCES = (ENV_SOURCE,)
+
+# prefix of `DIR_COLORS` sources naming `vivid(1)` themes.
+THEME_PREFIX = "theme:"
+
+# prefix of `DIR_COLORS` sources naming compiled databases, written by `lscolors compile`.
+COMPILED_PREFIX = "compiled:"
+
+
+def add_colors_argument(cli: "BaseCLI", parser: ArgumentParser) -> None:
     """Add arguments to parser."""
 
     _ = cli  # unused
 
     parser.add_argument(
         "dir_colors",
-        nargs="?",
+        nargs="*",
         metavar="DIR_COLORS",
-        help="read file `DIR_COLORS` instead of `$LS_COLORS`",
+        help=(
+            "read file `DIR_COLORS` instead of `$LS_COLORS`; "
+            f"`{default_database.NAME}` for the `dircolors --print-database` database, "
+            f"`{ENV_SOURCE}` for `$LS_COLORS`, `{THEME_PREFIX}FILE` for a `vivid` theme, "
+            f"`{COMPILED_PREFIX}FILE` for a compiled database; "
+            "when several are given, each overrides entries of those before it"
+        ),
     )
 
+    parser.add_argument(
+        "--theme",
+        metavar="FILE",
+        help=f"load `vivid` theme `FILE` first; short for `{THEME_PREFIX}FILE`",
+    )
 
-def load(options: Namespace) -> tuple[dict[str, str], str]:
+    parser.add_argument(
+        "--filetypes",
+        metavar="FILE",
+        help=(
+            "read `vivid` filetypes from `FILE`; default `filetypes.yml` near the "
+            "theme or in `~/.config/vivid`"
+        ),
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write the compiled database cache",
+    )
+
+    parser.add_argument(
+        "--lenient",
+        action="store_true",
+        help="warn about and skip invalid database entries instead of failing",
+    )
+
+
+def load(options: Namespace, allow_empty: bool = False) -> tuple[ColorDatabase, str]:
     """Load color database from `options.dir_colors`, if given, or `$LS_COLORS`.
 
+    `options.dir_colors` is a list of sources, merged in order with the last
+    one winning. Each entry records the source it came from.
+
+    An empty database, such as when no `TERM` block matches `$TERM`, is an
+    error unless `allow_empty`; `dircolors` sets an empty `$LS_COLORS` then.
+
     Return multiple values:
-        colors: dict, colors_by_filetype, k=filetype, v=color
+        colors: ColorDatabase, colors_by_filetype, k=filetype, v=color
         meta: str, identifies database loaded and, if relevant, the `$TERM` used.
     """
 
-    meta = f"dir_colors={options.dir_colors!r}" if options.dir_colors else "env=$LS_COLORS"
+    sources, meta = _sources(options)
     meta_with_term = meta + "; TERM=" + os.environ.get("TERM", "")
 
-    if options.dir_colors:
-        ls_colors = _compile_dir_colors(options, meta_with_term)
-    elif not (_ls_colors := os.environ.get("LS_COLORS")):
-        raise RuntimeError(f"missing `$LS_COLORS` environment variable; {meta}")
-    else:
-        ls_colors = _ls_colors
+    files = [
+        x
+        for x in sources
+        if x not in (default_database.NAME, ENV_SOURCE)
+        and not x.startswith((THEME_PREFIX, COMPILED_PREFIX))
+    ]
+    # k=file source, v=parsed file; parsed only when needed.
+    programs: dict[str, dircolors.Program] = {}
+    # k=theme source, v=path of its filetypes file.
+    themes = {
+        x: theme_utils.find_filetypes(x.removeprefix(THEME_PREFIX), options.filetypes)
+        for x in sources
+        if x.startswith(THEME_PREFIX)
+    }
 
-    if ls_colors:
-        ls_colors = ls_colors.strip(":")
-    if not ls_colors:
-        raise RuntimeError(f"empty database; {meta_with_term}")
+    key = None
+    if not options.no_cache and "-" not in files:
+        signatures = {x: load_signature(x, programs, meta_with_term) for x in files}
+        key = _cache_key(sources, signatures, themes)
+    if key and (cached := cache.get(key)) is not None:
+        colors, origins = cached
+        if not colors and not allow_empty:
+            raise RuntimeError(f"empty database; {meta_with_term}")
+        return ColorDatabase(colors, [(sources[i], x, y) for i, x, y in origins], key), meta
 
     colors = {}
-    for item in ls_colors.split(":"):
-        filetype, color = item.split("=")
-        if filetype.startswith("*."):
-            filetype = filetype[1:]
+    # k=filetype, v=(index of source, lineno, group comment)
+    where: dict[str, tuple[int, int, str]] = {}
+    errors = []
+    for i, source in enumerate(sources):
+        if source in files and source not in programs:
+            programs[source] = load_program(source, options.no_cache, meta_with_term)
+        layer, lines, layer_errors = _load_source(
+            source, programs.get(source), themes.get(source), options.no_cache, meta_with_term
+        )
+        for filetype in layer:
+            # keep entries in order of last definition, as `ls` searches them.
+            colors.pop(filetype, None)
+            colors[filetype] = layer[filetype]
+            lineno, comment = lines.get(filetype, (0, ""))
+            where[filetype] = (i, lineno, comment)
+        prefix = f"{source}: " if len(sources) > 1 and source in _UNNAMED_SOURCES else ""
+        errors.extend([prefix + x for x in layer_errors])
+
+    if errors:
+        if not options.lenient:
+            raise RuntimeError("\n".join(errors) + f"\ninvalid database; {meta_with_term}")
+        for error in errors:
+            print(f"{options.prog}: warning; {error}", file=sys.stderr)
+
+    if not colors and not allow_empty:
+        raise RuntimeError(f"empty database; {meta_with_term}")
+
+    origins = [where[x] for x in colors]
+    if key and not errors:
+        cache.put(key, (colors, origins))
+
+    return ColorDatabase(colors, [(sources[i], x, y) for i, x, y in origins], key), meta
+
+
+def _sources(options: Namespace) -> tuple[list[str], str]:
+    """Return sources to load for `options`, and meta identifying them."""
+
+    sources = list(options.dir_colors or ([] if options.theme else [ENV_SOURCE]))
+    if options.theme:
+        sources.insert(0, THEME_PREFIX + options.theme)
+
+    if sources == [ENV_SOURCE] and not options.dir_colors:
+        return sources, "env=$LS_COLORS"
+    if len(sources) == 1:
+        return sources, f"dir_colors={sources[0]!r}"
+    return sources, f"dir_colors={sources!r}"
+
+
+def load_program(source: str, no_cache: bool, meta: str) -> dircolors.Program:
+    """Return parsed `dir_colors(5)` file `source`, from cache if possible.
+
+    The parsed file is independent of `$TERM`, so it is cached once for all terminals.
+    """
+
+    key = None
+    try:
+        if source != "-" and not no_cache:
+            key = cache.file_key(source, "program")
+            if (value := cache.get(key)) is not None:
+                return dircolors.Program.from_value(value)
+        program = dircolors.parse_file(source)
+    except OSError as err:
+        print(err, file=sys.stderr)
+        raise RuntimeError(f"dircolors; {meta}") from err
+
+    if key:
+        cache.put(key, program.to_value())
+    return program
+
+
+def load_signature(source: str, programs: dict[str, dircolors.Program], meta: str) -> str:
+    """Return `Program.signature` of `dir_colors(5)` file `source` for this terminal.
+
+    Cached per file, `$TERM` and `$COLORTERM`, apart from the parsed file,
+    so finding a cached database reads one small entry, and parses and
+    compiles nothing. The parsed file is loaded into `programs` if needed.
+    """
+
+    term = os.environ.get("TERM") or "none"
+    colorterm = os.environ.get("COLORTERM", "")
+    key: str | None = None
+    # if the file cannot be stat'ed, that is reported by `load_program`.
+    with contextlib.suppress(OSError):
+        key = cache.file_key(source, "signature", term, colorterm)
+    if key and (signature := cache.get(key)) is not None:
+        return str(signature)
+
+    if source not in programs:
+        programs[source] = load_program(source, False, meta)
+    signature = programs[source].signature(term, colorterm)
+    if key:
+        cache.put(key, signature)
+    return signature
+
+
+def _load_source(
+    source: str,
+    program: dircolors.Program | None,
+    filetypes: str | None,
+    no_cache: bool,
+    meta: str,
+) -> tuple[dict[str, str], dict[str, tuple[int, str]], list[str]]:
+    """Load one database `source`; parsed as `program`, or a theme with `filetypes`.
+
+    Return multiple values:
+        colors: dict, colors_by_filetype, k=filetype, v=color, of the valid entries.
+        lines: dict, k=filetype, v=(lineno, group comment), if `source` has lines.
+        errors: list of diagnostics for each invalid entry.
+    """
+
+    if source == default_database.NAME:
+        if not _default_database_enabled():
+            return {}, {}, []
+        return dict(default_database.COLORS), default_database_lines(), []
+
+    if source == ENV_SOURCE:
+        if not (ls_colors := os.environ.get("LS_COLORS")):
+            raise RuntimeError(f"missing `$LS_COLORS` environment variable; {meta}")
+        colors, errors = parse(ls_colors)
+        return colors, {}, errors
+
+    if source.startswith(COMPILED_PREFIX):
+        try:
+            database = compiled.CompiledDatabase(source.removeprefix(COMPILED_PREFIX))
+        except (OSError, RuntimeError) as err:
+            raise RuntimeError(f"{err}; {meta}") from err
+        try:
+            return dict(database), {}, []
+        finally:
+            database.close()
+
+    if filetypes:
+        try:
+            colors, lines = theme_utils.load(
+                source.removeprefix(THEME_PREFIX), filetypes, no_cache
+            )
+        except RuntimeError as err:
+            raise RuntimeError(f"{err}; {meta}") from err
+        return colors, lines, []
+
+    assert program
+    try:
+        items = program.items(program.signature())
+    except RuntimeError as err:
+        print(err, file=sys.stderr)
+        raise RuntimeError(f"dircolors; {meta}") from err
+
+    return _parse_items(program.filename, items)
+
+
+def _parse_items(
+    filename: str,
+    items: list[dircolors.Item],
+) -> tuple[dict[str, str], dict[str, tuple[int, str]], list[str]]:
+    """Validate compiled `dir_colors(5)` `items`; return values as `_load_source` does."""
+
+    colors: dict[str, str] = {}
+    lines = {}
+    errors = []
+
+    for key, color, lineno, comment in items:
+        # `$LS_COLORS` is split on `:`, so its keys cannot hold one; file keys can.
+        if ":" in key:
+            error: str | None = f"unrecognized filetype {key!r}"
+        else:
+            error = _check_entry(key, color)
+        if error is not None:
+            errors.append(f"{filename}:{lineno}: {error}")
+            continue
+        filetype = key[1:] if key.startswith("*.") else key
+        colors.pop(filetype, None)
         colors[filetype] = color
+        lines[filetype] = (lineno, comment)
 
-    return colors, meta
+    return colors, lines, errors
 
 
-def _compile_dir_colors(options: Namespace, meta: str) -> str:
-    """Run system `dircolors` (/usr/bin/dircolors) and return value of `LS_COLORS`."""
+@functools.cache
+def default_database_lines() -> dict[str, tuple[int, str]]:
+    """Return lines of the default database, k=filetype, v=(lineno, group comment)."""
 
-    proc = subprocess.run(
-        ["dircolors", "--bourne-shell", options.dir_colors],
-        capture_output=True,
-        check=False,
-        shell=False,
-        text=True,
+    program = dircolors.Program.parse(
+        default_database.SOURCE.splitlines(), default_database.NAME
     )
+    return _parse_items(program.filename, program.items(program.signature("xterm")))[1]
+
+
+def parse(ls_colors: str) -> tuple[dict[str, str], list[str]]:
+    """Parse and validate `$LS_COLORS` value `ls_colors` in a single pass.
+
+    Return multiple values:
+        colors: dict, colors_by_filetype, k=filetype, v=color, of the valid entries.
+        errors: list of diagnostics, with byte offset, for each invalid entry.
+    """
+
+    colors: dict[str, str] = {}
+    errors = []
+    # byte offset of `ls_colors[char_offset]`, advanced incrementally.
+    char_offset = byte_offset = 0
+
+    for offset, key, color in iter_entries(ls_colors):
+        if (error := _check_entry(key, color)) is not None:
+            byte_offset += len(ls_colors[char_offset:offset].encode("utf-8", "surrogateescape"))
+            char_offset = offset
+            end = ls_colors.find(":", offset)
+            item = ls_colors[offset : end if end >= 0 else len(ls_colors)]
+            errors.append(f"byte {byte_offset}: {error} in {item!r}")
+            continue
+
+        assert color is not None
+        filetype = key[1:] if key.startswith("*.") else key
+        colors.pop(filetype, None)
+        colors[filetype] = color
 
-    if proc.returncode:
-        print(proc.stderr.strip(), file=sys.stderr)
-        raise RuntimeError(f"system dircolors; {meta}")
+    return colors, errors
+
+
+def iter_entries(ls_colors: str) -> Iterator[tuple[int, str, str | None]]:
+    """Yield `(offset, filetype, color)` for each `:`-separated entry in `ls_colors`.
+
+    `offset` is the character offset of the entry, and `color` is None if
+    the entry has no `=`. Empty entries are skipped.
+    """
+
+    start, end = 0, len(ls_colors)
+    while start < end:
+        if (stop := ls_colors.find(":", start)) < 0:
+            stop = end
+        if stop > start:
+            if (equals := ls_colors.find("=", start, stop)) < 0:
+                yield start, ls_colors[start:stop], None
+            else:
+                yield start, ls_colors[start:equals], ls_colors[equals + 1 : stop]
+        start = stop + 1
+
+
+def _check_entry(filetype: str, color: str | None) -> str | None:
+    """Return diagnostic if entry is invalid, else None."""
+
+    if color is None:
+        return "missing `=`"
+    if not filetype or (filetype[0] != "*" and filetype not in FILETYPE_CODES):
+        return f"unrecognized filetype {filetype!r}"
+    if filetype in ESCAPE_CODES or (filetype == "ln" and color == "target"):
+        return None
+    if RE_SGR.fullmatch(color):
+        return None
+    return "unexpected `=`" if "=" in color else f"invalid SGR sequence {color!r}"
+
+
+@contextlib.contextmanager
+def terminal(term: str, colorterm: str | None = None) -> Iterator[None]:
+    """Set `$TERM` and `$COLORTERM` for `load`, restoring them on exit.
+
+    `colorterm` None unsets `$COLORTERM`.
+    """
+
+    saved = {x: os.environ.get(x) for x in ("TERM", "COLORTERM")}
+    try:
+        for name, value in (("TERM", term), ("COLORTERM", colorterm)):
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _default_database_enabled() -> bool:
+    """Return True if the default database is enabled for this terminal."""
+
+    term = os.environ.get("TERM") or "none"
+    colorterm = os.environ.get("COLORTERM", "")
+
+    return any(dircolors.fnmatch(x, term) for x in default_database.TERMS) or any(
+        dircolors.fnmatch(x, colorterm) for x in default_database.COLORTERMS
+    )
+
+
+def _cache_key(
+    sources: list[str],
+    signatures: dict[str, str],
+    themes: dict[str, str],
+) -> str | None:
+    """Return cache key for the database `load` would compile, or None if uncacheable.
+
+    File sources are keyed by the file and the blocks enabled for this
+    terminal, so terminals that enable the same blocks share the database.
+    """
 
-    ls_colors = proc.stdout.strip()
-    len1 = len("LS_COLORS='")
-    len2 = len("';\nexport LS_COLORS")
-    if len(ls_colors) >= len1 + len2:
-        ls_colors = ls_colors[len1:-len2]
+    keys = []
+    for source in sources:
+        if source == default_database.NAME:
+            keys.append(cache.file_key(default_database.__file__))
+            keys.append(str(_default_database_enabled()))
+        elif source == ENV_SOURCE:
+            keys.append(cache.text_key(os.environ.get("LS_COLORS", "")))
+        elif source == "-":
+            return None
+        elif source.startswith(COMPILED_PREFIX):
+            try:
+                keys.append(cache.file_key(source.removeprefix(COMPILED_PREFIX)))
+            except OSError:
+                return None
+        elif source in themes:
+            try:
+                keys.append(cache.file_key(source.removeprefix(THEME_PREFIX)))
+                keys.append(cache.file_key(themes[source]))
+            except OSError:
+                return None
+        else:
+            try:
+                keys.append(cache.file_key(source))
+            except OSError:
+                return None
+            keys.append(signatures[source])
 
-    return ls_colors
+    return cache.combined_key(keys)
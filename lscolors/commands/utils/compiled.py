@@ -0,0 +1,248 @@
+"""Compiled databases; a binary format read through `mmap`, without parsing.
+
+Processes that map the same file share one page-cached copy, and look up
+keys in place; only the entries looked up are decoded.
+
+Layout, little-endian:
+
+    header      magic `LSCD`, version, entry count, color count, the
+                offsets of the sections below, the number of index slots,
+                and the file size.
+    entries     per key, sorted by key: offset and length of the key in
+                `strings`, index of its color, and its position in the database.
+    colors      per distinct color: offset and length in `strings`.
+    index       open-addressed hash table; per slot, index of an entry + 1,
+                or 0 if empty, hashed by `crc32` of the key.
+    strings     keys and colors, UTF-8.
+
+A compiled database is for one terminal; `TERM` blocks are resolved when compiling.
+"""
+
+import mmap
+import struct
+import zlib
+from collections.abc import Iterator, Mapping
+
+from lscolors.commands.utils import cache
+
+MAGIC = b"LSCD"
+VERSION = 1
+
+# magic, version, reserved, entries, colors, entries offset, colors offset,
+# index offset, index slots, strings offset, file size.
+_HEADER = struct.Struct("<4sHHIIIIIIII")
+# key offset, key length, color index, position.
+_ENTRY = struct.Struct("<IIII")
+# offset, length.
+_COLOR = struct.Struct("<II")
+_SLOT = struct.Struct("<I")
+
+
+def dumps(colors: Mapping[str, str]) -> bytes:
+    """Return `colors`, k=filetype, v=color, in compiled format."""
+
+    strings = bytearray()
+    # k=color, v=index in color table.
+    pool: dict[str, int] = {}
+    color_table = bytearray()
+
+    def add_string(text: str) -> tuple[int, int]:
+        data = text.encode("utf-8", "surrogateescape")
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    positions = {key: i for i, key in enumerate(colors)}
+    keys = sorted(colors, key=lambda x: x.encode("utf-8", "surrogateescape"))
+    entries = bytearray()
+    for key in keys:
+        color = colors[key]
+        if (index := pool.get(color)) is None:
+            index = pool[color] = len(pool)
+            color_table.extend(_COLOR.pack(*add_string(color)))
+        entries.extend(_ENTRY.pack(*add_string(key), index, positions[key]))
+
+    # at most half full.
+    slots = 1
+    while slots < 2 * len(keys):
+        slots *= 2
+    table = [0] * slots
+    for i, key in enumerate(keys):
+        slot = zlib.crc32(key.encode("utf-8", "surrogateescape")) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = i + 1
+    index_table = b"".join([_SLOT.pack(x) for x in table])
+
+    entries_offset = _HEADER.size
+    colors_offset = entries_offset + len(entries)
+    index_offset = colors_offset + len(color_table)
+    strings_offset = index_offset + len(index_table)
+    size = strings_offset + len(strings)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(keys),
+        len(pool),
+        entries_offset,
+        colors_offset,
+        index_offset,
+        slots,
+        strings_offset,
+        size,
+    )
+    return header + entries + color_table + index_table + strings
+
+
+def write(path: str, colors: Mapping[str, str]) -> None:
+    """Write `colors` to file `path` in compiled format.
+
+    The file is replaced atomically, so processes that have mapped the old
+    file keep reading it.
+
+    Raises:
+        OSError: if `path` cannot be written.
+    """
+
+    cache.write_atomic(path, dumps(colors))
+
+
+class CompiledDatabase(Mapping[str, str]):
+    """Compiled database file, mapped into memory; maps filetype to color.
+
+    Keys are as loaded by `colors.load`, and iterate in database order.
+    """
+
+    __slots__ = (
+        "_map",
+        "_count",
+        "_entries",
+        "_colors",
+        "_index",
+        "_slots",
+        "_strings",
+    )
+
+    _map: mmap.mmap
+    _count: int
+    _entries: int
+    _colors: int
+    _index: int
+    _slots: int
+    _strings: int
+
+    def __init__(self, path: str) -> None:
+        """Map compiled database file `path`.
+
+        Raises:
+            OSError: if `path` cannot be read.
+            RuntimeError: if `path` is not a compiled database of this version.
+        """
+
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:
+                # empty file.
+                raise RuntimeError(f"{path}: not a compiled database") from err
+
+        try:
+            self._check(path)
+        except RuntimeError:
+            self._map.close()
+            raise
+
+    def _check(self, path: str) -> None:
+        """Read and validate the header of compiled database file `path`.
+
+        Raises:
+            RuntimeError: if `path` is not a compiled database of this version.
+        """
+
+        if len(self._map) < _HEADER.size:
+            raise RuntimeError(f"{path}: not a compiled database")
+        (
+            magic,
+            version,
+            _,
+            self._count,
+            colors,
+            self._entries,
+            self._colors,
+            self._index,
+            self._slots,
+            self._strings,
+            size,
+        ) = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise RuntimeError(f"{path}: not a compiled database")
+        if version != VERSION:
+            raise RuntimeError(
+                f"{path}: compiled database version {version}; expected {VERSION}"
+            )
+        if (
+            self._entries + self._count * _ENTRY.size > self._colors
+            or self._colors + colors * _COLOR.size > self._index
+            or self._index + self._slots * _SLOT.size > self._strings
+            or self._strings > size
+            or size != len(self._map)
+            or self._slots & (self._slots - 1)
+        ):
+            raise RuntimeError(f"{path}: truncated or corrupt compiled database")
+
+    def __getitem__(self, key: str) -> str:
+        if (i := self._find(key.encode("utf-8", "surrogateescape"))) is None:
+            raise KeyError(key)
+        return self._color(_ENTRY.unpack_from(self._map, self._entries + i * _ENTRY.size)[2])
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            isinstance(key, str)
+            and self._find(key.encode("utf-8", "surrogateescape")) is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        # k=position, v=key.
+        keys = {}
+        for i in range(self._count):
+            offset, length, _, position = _ENTRY.unpack_from(
+                self._map, self._entries + i * _ENTRY.size
+            )
+            keys[position] = self._string(offset, length)
+        return iter([keys[x] for x in sorted(keys)])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def _find(self, key: bytes) -> int | None:
+        """Return index of the entry for `key`, or None."""
+
+        mask = self._slots - 1
+        slot = zlib.crc32(key) & mask
+        for _ in range(self._slots):
+            value: int = _SLOT.unpack_from(self._map, self._index + slot * _SLOT.size)[0]
+            if not value:
+                return None
+            offset, length, _, _ = _ENTRY.unpack_from(
+                self._map, self._entries + (value - 1) * _ENTRY.size
+            )
+            start = self._strings + offset
+            if self._map[start : start + length] == key:
+                return value - 1
+            slot = (slot + 1) & mask
+        return None
+
+    def _color(self, index: int) -> str:
+        """Return color `index` of the color pool."""
+        return self._string(*_COLOR.unpack_from(self._map, self._colors + index * _COLOR.size))
+
+    def _string(self, offset: int, length: int) -> str:
+        """Return string at `offset` of `length` bytes in the strings section."""
+
+        start = self._strings + offset
+        return self._map[start : start + length].decode("utf-8", "surrogateescape")
@@ -0,0 +1,166 @@
+"""lscolors color database."""
+
+from collections.abc import Iterable, Iterator, Mapping
+
+from lscolors.commands.utils.suffixes import Matcher
+
+# `Entry.kind`
+FILETYPE = "filetype"  # `di`, `ln`, `ex`, ...
+EXTENSION = "extension"  # `.gz`, from `*.gz`
+GLOB = "glob"  # any other `*` pattern; `*README`, `*~`
+
+# color -> (codes, escape); shared by all entries and databases.
+_sgr_pool: dict[str, tuple[tuple[int, ...], str]] = {}
+# codes -> codes; so equal parameter lists (`01;34`, `1;34`) share one tuple.
+_codes_pool: dict[tuple[int, ...], tuple[int, ...]] = {}
+
+
+def parse_sgr(color: str) -> tuple[tuple[int, ...], str]:
+    """Return interned `(codes, escape)` for `color`.
+
+    `codes` is the tuple of SGR parameters, and `escape` the escape
+    sequence to select the color; both are empty if `color` is not a
+    list of SGR parameters, such as `target` or an `lc` escape string.
+    """
+
+    if (sgr := _sgr_pool.get(color)) is None:
+        try:
+            codes = tuple(int(x) if x else 0 for x in color.split(";")) if color else ()
+            escape = f"\x1b[{color}m"
+        except ValueError:
+            codes, escape = (), ""
+        sgr = _sgr_pool[color] = (_codes_pool.setdefault(codes, codes), escape)
+    return sgr
+
+
+def format_codes(codes: Iterable[int]) -> str:
+    """Return `codes` formatted for sorting and filenames; e.g., `038-005-213`."""
+    return "-".join([f"{x:03}" for x in codes])
+
+
+class Entry:
+    """Database entry."""
+
+    __slots__ = ("key", "kind", "color", "codes", "escape", "source", "line", "comment")
+
+    def __init__(
+        self,
+        key: str,
+        color: str,
+        source: str | None = None,
+        line: int = 0,
+        comment: str = "",
+    ) -> None:
+        """Create database entry.
+
+        Args:
+            key: filetype, as keyed by `colors.load`.
+            color: SGR parameters, or other value.
+            source: name of database `key` was loaded from.
+            line: line number in `source`, or zero.
+            comment: group comment `key` appeared under in `source`.
+        """
+
+        self.key = key
+        self.source = source
+        self.line = line
+        self.comment = comment
+        self.kind = EXTENSION if key[0] == "." else GLOB if key[0] == "*" else FILETYPE
+        self.color = color
+        self.codes, self.escape = parse_sgr(color)
+
+    def __repr__(self) -> str:
+        return f"Entry({self.key!r}, {self.color!r})"
+
+    @property
+    def where(self) -> str:
+        """Return `source:line` where entry was defined, as known."""
+
+        if self.line:
+            return f"{self.source}:{self.line}"
+        return self.source or ""
+
+
+class ColorDatabase(Mapping[str, str]):
+    """Color database; maps filetype to color, with a parsed `Entry` for each.
+
+    Keys are as loaded by `colors.load`: two-letter filetype codes,
+    `.ext` for `*.ext` extensions, and other `*` patterns unchanged.
+    """
+
+    __slots__ = ("_entries", "_suffixes", "fingerprint")
+
+    def __init__(
+        self,
+        colors: Mapping[str, str],
+        origins: Iterable[tuple[str, int, str]] | None = None,
+        fingerprint: str | None = None,
+    ) -> None:
+        """Create database.
+
+        Args:
+            colors: k=filetype, v=color.
+            origins: `(source, line, comment)` of each item of `colors`, in order.
+            fingerprint: cache key identifying the sources of `colors`, if known;
+                for caching results derived from the database.
+        """
+
+        self.fingerprint = fingerprint
+        # k=(ignore_case, globs), v=matcher; built when first needed.
+        self._suffixes: dict[tuple[bool, bool], Matcher[Entry]] = {}
+        if origins is None:
+            self._entries = {key: Entry(key, color) for key, color in colors.items()}
+        else:
+            self._entries = {
+                key: Entry(key, color, *origin)
+                for (key, color), origin in zip(colors.items(), origins, strict=True)
+            }
+
+    def __getitem__(self, key: str) -> str:
+        return self._entries[key].color
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, key: str) -> Entry | None:
+        """Return `Entry` for `key`, or None."""
+        return self._entries.get(key)
+
+    def entries(self, kind: str | None = None) -> Iterator[Entry]:
+        """Return entries, optionally only those of `kind`, in database order."""
+
+        if kind is None:
+            return iter(self._entries.values())
+        return (x for x in self._entries.values() if x.kind == kind)
+
+    def match(self, name: str, ignore_case: bool = False, globs: bool = False) -> Entry | None:
+        """Return the extension or pattern entry `ls` colors file `name` with, or None.
+
+        As `ls`, the last defined of the entries `name` ends with; with
+        `ignore_case`, as `ls` of coreutils 9.2 and later matches them.
+        With `globs`, patterns such as `*README*` are matched as globs.
+        """
+
+        if (matcher := self._suffixes.get((ignore_case, globs))) is None:
+            matcher = self._suffixes[(ignore_case, globs)] = Matcher(
+                [(x.key, x.color, x) for x in self._entries.values() if x.kind != FILETYPE],
+                ignore_case,
+                globs,
+            )
+        return matcher.match(name)
+
+    def to_ls_colors(self) -> str:
+        """Return value for `$LS_COLORS`, formatted like `dircolors(1)`."""
+
+        return "".join(
+            [
+                f"{'*' if x.kind == EXTENSION else ''}{x.key}={x.color}:"
+                for x in self._entries.values()
+            ]
+        )
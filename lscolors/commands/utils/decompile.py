@@ -0,0 +1,100 @@
+"""Decompile a color database into a `dir_colors(5)` file."""
+
+from collections import defaultdict
+from collections.abc import Collection
+
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.database import FILETYPE, ColorDatabase, Entry
+from lscolors.commands.utils.dircolors import FILETYPES
+
+
+def decompile(
+    colors: ColorDatabase, title: str = "", comments: Collection[str] = ()
+) -> list[str]:
+    """Return lines of a `dir_colors(5)` file that compiles to `colors`.
+
+    Filetypes are written with their canonical keywords. Extensions and
+    other patterns are grouped by color, under the group comment of
+    `comments`, such as those `paint` recognizes, taken from where the
+    entries were defined or, failing that, from the default database.
+    Groups without such a comment come first, so `paint` does not carry a
+    group over to them.
+
+    `ls` applies the last matching pattern; patterns that are suffixes of
+    others with a different color are written in their original order,
+    ahead of the groups, so the result colors files the same.
+
+    Args:
+        colors: database to decompile.
+        title: first line of the header comment.
+        comments: group comments to keep; others are replaced by the color.
+    """
+
+    filetypes = []
+    patterns = []
+    for entry in colors.entries():
+        if entry.kind == FILETYPE:
+            name, description = FILETYPES.get(entry.key, (entry.key, ""))
+            description = description.removeprefix("- ")
+            filetypes.append(
+                f"{name} {entry.color}" + (f"  # {description}" if description else "")
+            )
+        else:
+            patterns.append(entry)
+
+    lines = [f"# {title}" if title else "# Decompiled by lscolors."]
+    if filetypes:
+        lines += ["", *filetypes]
+
+    overlapping = _overlapping(patterns)
+    if overlapping:
+        lines += ["", "# overlapping patterns; in order of definition."]
+        lines += [_line(x) for x in patterns if x.key in overlapping]
+
+    # k=(group comment, color), v=entries.
+    groups: dict[tuple[str, str], list[Entry]] = defaultdict(list)
+    builtin = colors_utils.default_database_lines()
+    for entry in patterns:
+        if entry.key in overlapping:
+            continue
+        comment = entry.comment
+        if comment not in comments:
+            comment = builtin.get(entry.key, (0, ""))[1]
+            if comment not in comments:
+                comment = ""
+        groups[(comment, entry.color)].append(entry)
+
+    for (comment, color), entries in sorted(groups.items(), key=lambda x: bool(x[0][0])):
+        lines += ["", comment or f"# {color}"]
+        lines += [_line(x) for x in entries]
+
+    return lines
+
+
+def _line(entry: Entry) -> str:
+    """Return `dir_colors(5)` line for pattern `entry`."""
+    return f"{entry.key} {entry.color}"
+
+
+def _overlapping(patterns: list[Entry]) -> set[str]:
+    """Return keys of `patterns` that overlap a pattern of another color.
+
+    A pattern overlaps another when the names it matches end with the other.
+    """
+
+    # `*README` matches names ending with `README`, and `.gz` those ending with `.gz`.
+    by_suffix = {_suffix(x.key): x for x in patterns}
+
+    overlapping = set()
+    for entry in patterns:
+        suffix = _suffix(entry.key)
+        for i in range(1, len(suffix)):
+            if (other := by_suffix.get(suffix[i:])) is not None and other.color != entry.color:
+                overlapping.add(entry.key)
+                overlapping.add(other.key)
+    return overlapping
+
+
+def _suffix(key: str) -> str:
+    """Return suffix of names matched by pattern `key`."""
+    return key[1:] if key[0] == "*" else key
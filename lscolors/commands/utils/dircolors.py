@@ -0,0 +1,395 @@
+"""Native `dir_colors(5)` compiler.
+
+Parse a `dir_colors(5)` database the same way as coreutils `dircolors.c`
+and return the value for `$LS_COLORS`, without running `dircolors(1)`.
+"""
+
+import os
+import re
+import sys
+from typing import Any, Iterable
+
+# `slack_codes` and `ls_codes` from `dircolors.c`; keywords are case-insensitive.
+KEYWORDS = {
+    "NORMAL": "no",
+    "NORM": "no",
+    "FILE": "fi",
+    "RESET": "rs",
+    "DIR": "di",
+    "LNK": "ln",
+    "LINK": "ln",
+    "SYMLINK": "ln",
+    "ORPHAN": "or",
+    "MISSING": "mi",
+    "FIFO": "pi",
+    "PIPE": "pi",
+    "SOCK": "so",
+    "BLK": "bd",
+    "BLOCK": "bd",
+    "CHR": "cd",
+    "CHAR": "cd",
+    "DOOR": "do",
+    "EXEC": "ex",
+    "LEFT": "lc",
+    "LEFTCODE": "lc",
+    "RIGHT": "rc",
+    "RIGHTCODE": "rc",
+    "END": "ec",
+    "ENDCODE": "ec",
+    "SUID": "su",
+    "SETUID": "su",
+    "SGID": "sg",
+    "SETGID": "sg",
+    "STICKY": "st",
+    "OTHER_WRITABLE": "ow",
+    "OWR": "ow",
+    "STICKY_OTHER_WRITABLE": "tw",
+    "OWT": "tw",
+    "CAPABILITY": "ca",
+    "MULTIHARDLINK": "mh",
+    "CLRTOEOL": "cl",
+}
+
+# k=`$LS_COLORS` code, v=(canonical keyword, description).
+FILETYPES = {
+    "no": ("NORMAL", "- Normal (nonfilename) text"),
+    "fi": ("FILE", "- Regular File"),
+    "di": ("DIR", "- Directory"),
+    "ln": ("LINK", "- Symbolic Link"),
+    "pi": ("FIFO", "- Named Pipe"),
+    "so": ("SOCK", "- Unix Domain Socket"),
+    "do": ("DOOR", "- Door"),
+    "bd": ("BLK", "- Block Device"),
+    "cd": ("CHR", "- Character Device"),
+    "or": ("ORPHAN", "- Orphaned Symbolic Link"),
+    "mi": ("MISSING", "- Missing File"),
+    "su": ("SETUID", "- Set User ID"),
+    "sg": ("SETGID", "- Set Group ID"),
+    "tw": ("STICKY_OTHER_WRITABLE", ""),
+    "ow": ("OTHER_WRITABLE", "- Other Writable"),
+    "st": ("STICKY", "- Sticky"),
+    "ex": ("EXEC", "- Executable"),
+    "rs": ("RESET", "- Reset to NORMAL"),
+    "mh": ("MULTIHARDLINK", "- Multiple Hard Links"),
+    "ca": ("CAPABILITY", ""),
+    "lc": ("LEFTCODE", "- Left Code"),
+    "rc": ("RIGHTCODE", "- Right Code"),
+    "ec": ("ENDCODE", "- End Code"),
+    "cl": ("CLRTOEOL", "- Clear to End of Line"),
+}
+
+# slackware keywords that `dircolors` recognizes but ignores.
+_IGNORED = ("OPTIONS", "COLOR", "EIGHTBIT")
+
+# `c_isspace`
+_SPACE = " \t\n\v\f\r"
+
+
+def parse_line(line: str) -> tuple[str | None, str | None]:
+    """Split `line` into `(keyword, arg)`, like `parse_line` in `dircolors.c`.
+
+    Leading and trailing spaces, and spaces between keyword and arg, are
+    stripped; the arg ends at the first `#`. Blank lines and comments
+    return `(None, None)`, and a keyword without an arg returns `(keyword, None)`.
+    """
+
+    stripped = line.lstrip(_SPACE)
+    if not stripped or stripped[0] == "#":
+        return None, None
+
+    end = 0
+    while end < len(stripped) and stripped[end] not in _SPACE:
+        end += 1
+    keyword = stripped[:end]
+
+    rest = stripped[end:].lstrip(_SPACE)
+    if not rest or rest[0] == "#":
+        return keyword, None
+
+    if (i := rest.find("#")) >= 0:
+        rest = rest[:i]
+    return keyword, rest.rstrip(_SPACE)
+
+
+# `(key, arg, lineno, comment)`; `key` as in `$LS_COLORS`, and `comment` the
+# group comment the line appeared under.
+Item = tuple[str, str, int, str]
+
+# `(terms, colorterms, items, errors)`
+Block = tuple[tuple[str, ...], tuple[str, ...], list[Item], list[tuple[int, str]]]
+
+
+class Program:
+    """Parsed `dir_colors(5)` database, ready to compile for any terminal.
+
+    The lines are split into blocks. Each run of `TERM` and `COLORTERM`
+    lines starts a block, which is enabled when `$TERM` matches any of
+    its `TERM` globs or `$COLORTERM` any of its `COLORTERM` globs, as in
+    `dc_parse_stream`. Block 0 holds the lines before the first run and is
+    always enabled.
+
+    The compiled database depends only on which blocks are enabled, the
+    `signature`, so terminals with the same signature share it.
+
+    Each item records its line number and group comment: the first line
+    of the closest run of comment lines above it, not counting
+    commented-out entries.
+    """
+
+    __slots__ = ("filename", "blocks", "errors", "_matchers", "_signatures")
+
+    def __init__(
+        self, filename: str, blocks: list[Block], errors: list[tuple[int, str]]
+    ) -> None:
+        """Create program.
+
+        Args:
+            filename: name of parsed file.
+            blocks: `(terms, colorterms, items, errors)` for each block, where
+                `errors` are `(lineno, diagnostic)` reported only when the block
+                is enabled.
+            errors: `(lineno, diagnostic)` always reported.
+        """
+
+        self.filename = filename
+        self.blocks = blocks
+        self.errors = errors
+        # one regex per block, matching all of its globs.
+        self._matchers = [
+            (_compile_globs(terms), _compile_globs(colorterms))
+            for terms, colorterms, _, _ in blocks
+        ]
+        self._signatures: dict[tuple[str, str], str] = {}
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], filename: str = "<internal>") -> "Program":
+        """Parse `dir_colors(5)` `lines`; `filename` is used in diagnostics."""
+
+        blocks: list[Block] = [((), (), [], [])]
+        errors = []
+        in_terms = False
+        comment = ""
+        in_comments = False
+
+        for lineno, line in enumerate(lines, start=1):
+            keyword, arg = parse_line(line)
+            if keyword is None:
+                stripped = line.strip(_SPACE)
+                if not stripped or _is_commented_out(stripped):
+                    in_comments = False
+                elif not in_comments:
+                    comment = line.rstrip(_SPACE)
+                    in_comments = True
+                continue
+
+            in_comments = False
+            if arg is None:
+                errors.append(
+                    (lineno, f"{filename}:{lineno}: invalid line;  missing second token")
+                )
+                continue
+
+            upper = keyword.upper()
+            if upper in ("TERM", "COLORTERM"):
+                if not in_terms:
+                    blocks.append(((), (), [], []))
+                    in_terms = True
+                terms, colorterms, items, block_errors = blocks[-1]
+                if upper == "TERM":
+                    terms += (arg,)
+                else:
+                    colorterms += (arg,)
+                blocks[-1] = (terms, colorterms, items, block_errors)
+                continue
+
+            in_terms = False
+            if (key := _key(keyword)) is None:
+                # like `dircolors`, only reported after a matching `TERM`.
+                if len(blocks) > 1:
+                    message = f"{filename}:{lineno}: unrecognized keyword {keyword}"
+                    blocks[-1][3].append((lineno, message))
+            elif key:
+                blocks[-1][2].append((key, arg, lineno, comment))
+
+        return cls(filename, blocks, errors)
+
+    @classmethod
+    def from_value(cls, value: Any) -> "Program":
+        """Create program from `value`, as returned by `to_value`."""
+        return cls(*value)
+
+    def to_value(self) -> Any:
+        """Return program as builtin types, for `marshal`."""
+        return self.filename, self.blocks, self.errors
+
+    def signature(self, term: str | None = None, colorterm: str | None = None) -> str:
+        """Return indices of blocks enabled for `term` and `colorterm`, as a string.
+
+        `term` defaults to `$TERM`, or `none` if unset, and `colorterm` to
+        `$COLORTERM`, or the empty string if unset.
+        """
+
+        if term is None:
+            term = os.environ.get("TERM") or "none"
+        if colorterm is None:
+            colorterm = os.environ.get("COLORTERM", "")
+
+        if (signature := self._signatures.get((term, colorterm))) is None:
+            signature = self._signatures[(term, colorterm)] = ",".join(
+                [
+                    str(i)
+                    for i, (terms, colorterms) in enumerate(self._matchers)
+                    if i == 0
+                    or (terms and terms.fullmatch(term))
+                    or (colorterms and colorterms.fullmatch(colorterm))
+                ]
+            )
+        return signature
+
+    def items(self, signature: str) -> list[Item]:
+        """Return items of the blocks enabled by `signature`, in order.
+
+        Raises:
+            RuntimeError: listing each invalid line, as `dircolors` would report them.
+        """
+
+        enabled = [self.blocks[int(x)] for x in signature.split(",")]
+
+        errors = list(self.errors)
+        for _, _, _, block_errors in enabled[1:]:
+            errors.extend(block_errors)
+        if errors:
+            raise RuntimeError("\n".join([x for _, x in sorted(errors)]))
+
+        return [item for _, _, items, _ in enabled for item in items]
+
+    def compile(self, signature: str) -> str:
+        """Return value for `$LS_COLORS` for the blocks enabled by `signature`.
+
+        Raises:
+            RuntimeError: listing each invalid line, as `dircolors` would report them.
+        """
+
+        return "".join([f"{key}={arg}:" for key, arg, _, _ in self.items(signature)])
+
+
+def compile_lines(
+    lines: Iterable[str],
+    filename: str = "<internal>",
+    term: str | None = None,
+    colorterm: str | None = None,
+) -> str:
+    """Compile `dir_colors(5)` `lines` and return the value for `$LS_COLORS`.
+
+    Args:
+        lines: lines of a `dir_colors(5)` database.
+        filename: name used in diagnostics.
+        term: terminal type; defaults to `$TERM`, or `none` if unset.
+        colorterm: defaults to `$COLORTERM`, or the empty string if unset.
+
+    Raises:
+        RuntimeError: listing each invalid line, as `dircolors` would report them.
+    """
+
+    program = Program.parse(lines, filename)
+    return program.compile(program.signature(term, colorterm))
+
+
+def _key(keyword: str) -> str | None:
+    """Return `$LS_COLORS` key for `keyword`; empty if ignored, None if unrecognized."""
+
+    if keyword[0] == ".":
+        return "*" + keyword
+    if keyword[0] == "*":
+        return keyword
+    if (upper := keyword.upper()) in _IGNORED:
+        return ""
+    return KEYWORDS.get(upper)
+
+
+def _is_commented_out(comment: str) -> bool:
+    """Return True if `comment` is a commented-out entry, such as `#.cmd 01;32`."""
+
+    keyword, arg = parse_line(comment.lstrip("#"))
+    return keyword is not None and arg is not None and _key(keyword) is not None
+
+
+def parse_file(path: str) -> Program:
+    """Parse `dir_colors(5)` file `path` (`-` for `stdin`)."""
+
+    if path == "-":
+        return Program.parse(sys.stdin, "-")
+
+    with open(path, encoding="utf-8", errors="surrogateescape") as file:
+        return Program.parse(file, path)
+
+
+def compile_file(
+    path: str,
+    term: str | None = None,
+    colorterm: str | None = None,
+) -> str:
+    """Compile `dir_colors(5)` file `path` (`-` for `stdin`); return value for `$LS_COLORS`."""
+
+    program = parse_file(path)
+    return program.compile(program.signature(term, colorterm))
+
+
+_globs: dict[str, re.Pattern[str]] = {}
+
+
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Return one regex matching any of `patterns`, or None if there are none."""
+
+    if not patterns:
+        return None
+    return re.compile("|".join([f"(?:{_translate(x)})" for x in patterns]), re.DOTALL)
+
+
+def fnmatch(pattern: str, string: str) -> bool:
+    """Return True if `string` matches `pattern`, like `fnmatch(3)` with no flags."""
+
+    if (regex := _globs.get(pattern)) is None:
+        regex = _globs[pattern] = re.compile(_translate(pattern), re.DOTALL)
+    return regex.fullmatch(string) is not None
+
+
+def _translate(pattern: str) -> str:
+    """Translate `fnmatch(3)` `pattern` to a regular expression.
+
+    Unlike `fnmatch.translate`, honor backslash escapes and `[^...]` negation.
+    """
+
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            out.append(".*")
+        elif char == "?":
+            out.append(".")
+        elif char == "\\" and i < n:
+            out.append(re.escape(pattern[i]))
+            i += 1
+        elif char == "[":
+            j = i
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            body = pattern[i:j]
+            i = j + 1
+            negate = body[:1] in ("!", "^")
+            if negate:
+                body = body[1:]
+            body = body.replace("\\", "\\\\").replace("[", "\\[")
+            out.append(f"[{'^' if negate else ''}{body}]")
+        else:
+            out.append(re.escape(char))
+    return "".join(out)
@@ -0,0 +1,171 @@
+"""Export a color database for other programs.
+
+Formats:
+    ls: `$LS_COLORS`, for GNU `ls`.
+    bsd: `$LSCOLORS`, for BSD and macOS `ls`.
+    exa: `$EXA_COLORS`, for `exa` and `eza`.
+    tree: `$TREE_COLORS`, for `tree`.
+    fd: `$LS_COLORS`, for `fd`.
+    zsh: `list-colors` style, for zsh completion.
+"""
+
+import shlex
+
+from lscolors.commands.utils import cache
+from lscolors.commands.utils.database import EXTENSION, FILETYPE, ColorDatabase, parse_sgr
+from lscolors.commands.utils.minify import LS_DEFAULTS, normalize, tokenize
+
+FORMATS = ("ls", "bsd", "exa", "tree", "fd", "zsh")
+
+# k=format, v=environment variable.
+VARIABLES = {
+    "ls": "LS_COLORS",
+    "bsd": "LSCOLORS",
+    "exa": "EXA_COLORS",
+    "tree": "TREE_COLORS",
+    "fd": "LS_COLORS",
+}
+
+# filetypes, in `$LSCOLORS` order.
+_BSD_FILETYPES = ("di", "ln", "so", "pi", "ex", "bd", "cd", "su", "sg", "tw", "ow")
+# k=SGR token, v=(0 for foreground or 1 for background, `$LSCOLORS` letter); letters
+# `a-h` select colors 0-7, `A-H` bright colors, and `x` the default.
+_BSD_COLORS: dict[tuple[int, ...], tuple[int, str]] = {
+    **{(30 + i,): (0, x) for i, x in enumerate("abcdefgh")},
+    **{(90 + i,): (0, x) for i, x in enumerate("ABCDEFGH")},
+    **{(40 + i,): (1, x) for i, x in enumerate("abcdefgh")},
+    **{(100 + i,): (1, x) for i, x in enumerate("ABCDEFGH")},
+    **{(38, 5, i): (0, x) for i, x in enumerate("abcdefghABCDEFGH")},
+    **{(48, 5, i): (1, x) for i, x in enumerate("abcdefghABCDEFGH")},
+    (39,): (0, "x"),
+    (49,): (1, "x"),
+}
+# other extended colors have no letter; k=SGR parameter, v=0 or 1 as above.
+_BSD_EXTENDED = {38: 0, 48: 1}
+
+# filetypes known to `exa` and `eza`; extensions and patterns are known too.
+_EXA_FILETYPES = frozenset(["di", "ex", "fi", "pi", "so", "bd", "cd", "ln", "or"])
+
+# filetypes known to zsh `list-colors`.
+_ZSH_FILETYPES = frozenset(
+    [
+        "no",
+        "fi",
+        "di",
+        "ln",
+        "pi",
+        "so",
+        "bd",
+        "cd",
+        "or",
+        "mi",
+        "su",
+        "sg",
+        "tw",
+        "ow",
+        "st",
+        "ex",
+        "lc",
+        "rc",
+        "ec",
+    ]
+)
+
+
+def export(
+    colors: ColorDatabase,
+    formats: tuple[str, ...] = FORMATS,
+    no_cache: bool = False,
+) -> dict[str, str]:
+    """Return `colors` in each of `formats`, in one pass over the database.
+
+    Results are cached by `colors.fingerprint`, when known.
+
+    Args:
+        colors: database to export.
+        formats: names of formats, from `FORMATS`.
+        no_cache: do not read or write the cache.
+
+    Return:
+        dict, k=format, v=value of its environment variable; for `zsh`,
+        the `list-colors` entries, `:`-separated.
+    """
+
+    key = None
+    if colors.fingerprint and not no_cache:
+        key = cache.combined_key([colors.fingerprint, "export", *formats])
+        if (cached := cache.get(key)) is not None:
+            return dict(cached)
+
+    ls_colors = []
+    exa_colors = []
+    zsh_colors = []
+    bsd = dict.fromkeys(_BSD_FILETYPES, "")
+
+    for entry in colors.entries():
+        item = f"{'*' if entry.kind == EXTENSION else ''}{entry.key}={normalize(entry.color)}"
+        ls_colors.append(item)
+        if not entry.escape:
+            # `ln=target` and escape strings.
+            if entry.key in ("lc", "rc", "ec"):
+                zsh_colors.append(item)
+            continue
+        is_filetype = entry.kind == FILETYPE
+        if not is_filetype or entry.key in _EXA_FILETYPES:
+            exa_colors.append(item)
+        if not is_filetype or entry.key in _ZSH_FILETYPES:
+            zsh_colors.append(item)
+        if entry.key in bsd:
+            bsd[entry.key] = _bsd_color(entry.codes)
+
+    values = {
+        "ls": ":".join(ls_colors),
+        "bsd": "".join(
+            [x or _bsd_color(parse_sgr(LS_DEFAULTS[key])[0]) for key, x in bsd.items()]
+        ),
+        "exa": ":".join(exa_colors),
+        "tree": ":".join(ls_colors),
+        "fd": ":".join(ls_colors),
+        "zsh": ":".join(zsh_colors),
+    }
+    exported = {x: values[x] for x in formats}
+
+    if key:
+        cache.put(key, exported)
+    return exported
+
+
+def shell_lines(exported: dict[str, str]) -> list[str]:
+    """Return `sh` commands to set the values of `exported`, as returned by `export`."""
+
+    lines = []
+    for fmt, value in exported.items():
+        if fmt == "zsh":
+            items = " ".join([shlex.quote(x) for x in value.split(":") if x])
+            line = f"zstyle ':completion:*' list-colors {items}"
+        else:
+            line = f"export {VARIABLES[fmt]}={shlex.quote(value)}"
+        if line not in lines:
+            lines.append(line)
+    return lines
+
+
+def _bsd_color(codes: tuple[int, ...]) -> str:
+    """Return `$LSCOLORS` foreground and background letters for SGR `codes`."""
+
+    bold = False
+    # foreground, background.
+    letters = ["x", "x"]
+    for token in tokenize(list(codes)) or []:
+        if token == (0,):
+            bold, letters = False, ["x", "x"]
+        elif token == (1,):
+            bold = True
+        elif (color := _BSD_COLORS.get(token)) is not None:
+            letters[color[0]] = color[1]
+        elif token[0] in _BSD_EXTENDED:
+            letters[_BSD_EXTENDED[token[0]]] = "x"
+
+    if bold and letters[0] != "x":
+        letters[0] = letters[0].upper()
+    return "".join(letters)
@@ -0,0 +1,105 @@
+"""Resolve symbolic links to their final targets, sharing the links of chains.
+
+`ls` stats the target of each symbolic link, for `LINK target` and
+`ORPHAN`; the kernel follows the whole chain each time. In symlink farms,
+such as GNU stow packages and nix profiles, many links lead through the
+same links to the same targets, and every hop may be a network round
+trip. `LinkResolver` follows chains one link at a time, caching the final
+target of each link it passes, by `(st_dev, st_ino)`, and of each target
+path; so each link is read once, however many chains pass through it.
+"""
+
+import os
+import stat
+
+# as `MAXSYMLINKS` of Linux; longer chains fail with `ELOOP`.
+MAXSYMLINKS = 40
+
+
+class LinkResolver:
+    """Resolves symbolic links, caching the target of each link and path it passes.
+
+    Results are as of when first resolved; use one resolver per walk, or
+    `clear` it, to see later changes. Safe to share between threads; a
+    race resolves a link twice, with the same result.
+    """
+
+    __slots__ = ("_inodes", "_paths", "readlinks")
+
+    def __init__(self) -> None:
+        """Create resolver with empty caches."""
+
+        # k=(st_dev, st_ino) of a link, v=`stat` of its final target, or None.
+        self._inodes: dict[tuple[int, int], os.stat_result | None] = {}
+        # k=target path, v=the same.
+        self._paths: dict[str, os.stat_result | None] = {}
+        # number of links read.
+        self.readlinks = 0
+
+    def clear(self) -> None:
+        """Forget all resolved links."""
+
+        self._inodes.clear()
+        self._paths.clear()
+
+    def target(self, path: str, st: os.stat_result | None = None) -> os.stat_result | None:
+        """Return `os.stat(path)`, or None if it fails; e.g., missing target, or a loop.
+
+        Args:
+            path: name of a file, usually a symbolic link.
+            st: result of `os.lstat(path)`, if already known.
+        """
+
+        if st is None:
+            try:
+                st = os.lstat(path)
+            except OSError:
+                return None
+
+        # links and target paths passed; all resolve to `result`.
+        inodes: list[tuple[int, int]] = []
+        paths: list[str] = []
+        result: os.stat_result | None = None
+        while stat.S_ISLNK(st.st_mode):
+            key = (st.st_dev, st.st_ino)
+            if key in self._inodes:
+                result = self._inodes[key]
+                break
+            if key in inodes or len(inodes) >= MAXSYMLINKS:
+                # a loop; `ELOOP`.
+                break
+            inodes.append(key)
+
+            try:
+                link = os.readlink(path)
+            except OSError:
+                break
+            self.readlinks += 1
+            path = _join(path, link)
+            if path in self._paths:
+                result = self._paths[path]
+                break
+            paths.append(path)
+
+            try:
+                st = os.lstat(path)
+            except OSError:
+                break
+        else:
+            result = st
+
+        for key in inodes:
+            self._inodes[key] = result
+        for path in paths:
+            self._paths[path] = result
+        return result
+
+
+def _join(path: str, link: str) -> str:
+    """Return path of target `link` of symbolic link `path`, as the kernel resolves it."""
+
+    target = os.path.join(os.path.dirname(path), link)
+    if ".." in target.split(os.sep):
+        # `..` after a symbolic link to a directory is not its lexical parent.
+        return target
+    return os.path.normpath(target)
@@ -0,0 +1,66 @@
+"""Bounded least-recently-used cache, with statistics."""
+
+from collections import OrderedDict
+from typing import Any
+
+
+class LRUCache:
+    """Maps keys to values, keeping at most `maxsize` of the most recently used.
+
+    Counts hits, misses and evictions, for sizing the cache to the workload.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "evictions", "_items")
+
+    def __init__(self, maxsize: int) -> None:
+        """Create cache of at most `maxsize` items; zero disables it."""
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: OrderedDict[Any, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return value cached under `key`, marking it most recently used; else `default`."""
+
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Cache `value` under `key`, evicting the least recently used item if full."""
+
+        if self.maxsize <= 0:
+            return
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def items(self) -> list[tuple[Any, Any]]:
+        """Return cached `(key, value)` items, least recently used first, without using them."""
+        return list(self._items.items())
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove and return value cached under `key`, else `default`."""
+        return self._items.pop(key, default)
+
+    def stats(self) -> str:
+        """Return summary of the counters; e.g., for `-vv` output."""
+
+        lookups = self.hits + self.misses
+        rate = f"{100 * self.hits / lookups:.1f}%" if lookups else "-"
+        return (
+            f"{self.hits} hits, {self.misses} misses ({rate} hit rate), "
+            f"{self.evictions} evictions; {len(self)}/{self.maxsize} entries"
+        )
@@ -0,0 +1,203 @@
+"""Canonical SGR parameters and minified `$LS_COLORS` values."""
+
+from collections.abc import Mapping
+
+from lscolors.commands.utils.colors import ESCAPE_CODES, RE_SGR
+
+# `color_indicator` in `ls.c`; the colors `ls` uses for filetypes missing from
+# `$LS_COLORS`. `ca` is unset since coreutils 9.0, and is not listed.
+LS_DEFAULTS = {
+    "rs": "0",
+    "di": "01;34",
+    "ln": "01;36",
+    "pi": "33",
+    "so": "01;35",
+    "bd": "01;33",
+    "cd": "01;33",
+    "ex": "01;32",
+    "do": "01;35",
+    "su": "37;41",
+    "sg": "30;43",
+    "st": "37;44",
+    "ow": "34;42",
+    "tw": "30;42",
+}
+
+# filetypes `ls` colors only when set to a color; `is_colored` in `ls.c` takes
+# values "", "0" and "00" as unset.
+_UNSET_UNLESS_COLORED = frozenset(["ca", "mh", "mi"])
+_UNCOLORED = frozenset(["", "0", "00"])
+
+# attribute off -> attributes turned off.
+_ATTRIBUTES_OFF = {
+    22: (1, 2),
+    23: (3,),
+    24: (4,),
+    25: (5, 6),
+    27: (7,),
+    28: (8,),
+    29: (9,),
+}
+
+_ATTRIBUTES = frozenset(range(1, 10))
+_FOREGROUND = frozenset([*range(30, 40), *range(90, 98)])
+_BACKGROUND = frozenset([*range(40, 50), *range(100, 108)])
+_UNDERLINE = frozenset([58, 59])
+
+# extended colors, `38;5;N` and `38;2;R;G;B`; k=form, v=number of parameters.
+_EXTENDED = frozenset([38, 48, 58])
+_EXTENDED_LENGTH = {5: 3, 2: 5}
+
+
+def normalize(color: str, keep_reset: bool = True) -> str:
+    """Return canonical form of SGR parameters `color`.
+
+    Parameters are parsed into the terminal state they select: attributes,
+    foreground, background and underline colors, including 256-color and
+    24-bit `38/48/58` forms. The state is emitted with leading zeros,
+    duplicates and overridden parameters removed, and anything before the
+    last reset dropped; e.g., `00;01;034;1` becomes `0;1;34`.
+
+    Lists with parameters outside that model are only cleaned up, keeping
+    their order. Values that are not SGR parameters, such as `target`, are
+    returned unchanged.
+
+    Args:
+        color: value of a `$LS_COLORS` entry.
+        keep_reset: if False, drop a leading reset, for contexts where
+            the terminal is known to be reset already.
+    """
+
+    if not color or not RE_SGR.fullmatch(color):
+        return color
+
+    if (tokens := tokenize([int(x) if x else 0 for x in color.split(";")])) is None:
+        # malformed `38/48/58`; only drop leading zeros.
+        return ";".join([str(int(x)) if x else "0" for x in color.split(";")])
+
+    if (out := _state(tokens)) is None:
+        out = _cleanup(tokens)
+
+    if not keep_reset and len(out) > 1 and out[0] == (0,):
+        del out[0]
+    return ";".join([str(x) for token in out for x in token])
+
+
+def tokenize(params: list[int]) -> list[tuple[int, ...]] | None:
+    """Return SGR `params` split into tokens; one per parameter, or extended color.
+
+    Extended colors are `38;5;N` and `38;2;R;G;B`, and likewise for `48`
+    and `58`. Return None if an extended color is malformed.
+    """
+
+    tokens: list[tuple[int, ...]] = []
+    i, n = 0, len(params)
+    while i < n:
+        param = params[i]
+        length = 1
+        if param in _EXTENDED:
+            form = params[i + 1] if i + 1 < n else 0
+            if (length := _EXTENDED_LENGTH.get(form, 0)) == 0 or i + length > n:
+                return None
+        tokens.append(tuple(params[i : i + length]))
+        i += length
+    return tokens
+
+
+def _state(tokens: list[tuple[int, ...]]) -> list[tuple[int, ...]] | None:
+    """Return canonical tokens for the state `tokens` select; None if not modeled."""
+
+    reset = False
+    # k=attribute, v=True if on, False if turned off.
+    attributes: dict[int, bool] = {}
+    # foreground, background, underline.
+    colors: list[tuple[int, ...] | None] = [None, None, None]
+
+    for token in tokens:
+        param = token[0]
+        if param == 0:
+            reset = True
+            attributes.clear()
+            colors = [None, None, None]
+        elif param in _ATTRIBUTES:
+            attributes[param] = True
+        elif param in _ATTRIBUTES_OFF:
+            for attribute in _ATTRIBUTES_OFF[param]:
+                attributes[attribute] = False
+        elif param in _FOREGROUND:
+            colors[0] = token
+        elif param in _BACKGROUND:
+            colors[1] = token
+        elif param in _UNDERLINE:
+            colors[2] = token
+        else:
+            return None
+
+    out: list[tuple[int, ...]] = [(0,)] if reset else []
+    if not reset:
+        # `22` turns off both `1` and `2`, so offs precede ons.
+        out.extend(
+            [
+                (off,)
+                for off, turned_off in _ATTRIBUTES_OFF.items()
+                if any(attributes.get(x) is False for x in turned_off)
+            ]
+        )
+    out.extend([(x,) for x in sorted(attributes) if attributes[x]])
+    for default, selected in zip((39, 49, 59), colors, strict=True):
+        if selected is not None and not (reset and selected == (default,)):
+            out.append(selected)
+    return out
+
+
+def _cleanup(tokens: list[tuple[int, ...]]) -> list[tuple[int, ...]]:
+    """Return `tokens` after the last reset, without consecutive duplicates."""
+
+    start = 0
+    for i, token in enumerate(tokens):
+        if token == (0,):
+            start = i
+    out: list[tuple[int, ...]] = []
+    for token in tokens[start:]:
+        if not out or out[-1] != token:
+            out.append(token)
+    return out
+
+
+def minify(colors: Mapping[str, str]) -> str:
+    """Return the smallest `$LS_COLORS` value equivalent to `colors`.
+
+    Colors are normalized, and entries that select the color `ls` would
+    use anyway, per `LS_DEFAULTS`, are dropped, as are `ca`, `mh` and `mi`
+    entries that `ls` takes as unset. Leading resets are dropped
+    when `ls` resets the terminal before each filename anyway: when `no` is
+    not colored, and `rs` and `ec` are the defaults.
+
+    Args:
+        colors: k=filetype, v=color, as loaded by `colors.load`.
+    """
+
+    keep_reset = (
+        normalize(colors.get("no", "0")) not in ("", "0")
+        or normalize(colors.get("rs", "0")) != "0"
+        or "ec" in colors
+    )
+
+    entries = []
+    for key, color in colors.items():
+        if key in ESCAPE_CODES:
+            entries.append(f"{key}={color}")
+            continue
+        if key in _UNSET_UNLESS_COLORED and color in _UNCOLORED:
+            continue
+        value = normalize(color, keep_reset or key in ("no", "rs"))
+        if key in _UNSET_UNLESS_COLORED and value in _UNCOLORED:
+            # e.g., `0;0`; colored, so not to be shortened to a value taken as unset.
+            value = color
+        if (default := LS_DEFAULTS.get(key)) is not None and value == normalize(
+            default, keep_reset
+        ):
+            continue
+        entries.append(f"{'*' if key[0] == '.' else ''}{key}={value}")
+
+    return ":".join(entries)
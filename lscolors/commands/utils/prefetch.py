@@ -0,0 +1,78 @@
+"""Run blocking calls ahead of their results being needed, in a bounded thread pool.
+
+For stat'ing files on network filesystems, such as NFS and sshfs, where
+each call waits on a round trip; many calls in flight at once hide the
+latency. Results are yielded in input order, and at most `depth` calls
+are in flight, so items are read from the input only as fast as results
+are consumed, and memory stays flat however many there are.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Prefetcher:
+    """Bounded thread pool, mapping a function over items in order."""
+
+    def __init__(self, workers: int = 1, depth: int | None = None) -> None:
+        """Create prefetcher of `workers` threads, with at most `depth` calls in flight.
+
+        With one worker, calls are made in the calling thread, when their
+        results are needed. `depth` defaults to four calls per worker.
+
+        Raises:
+            ValueError: if `workers` or `depth` is less than one.
+        """
+
+        if workers < 1:
+            raise ValueError(f"workers {workers}; expected at least 1")
+        self.depth = 4 * workers if depth is None else depth
+        if self.depth < 1:
+            raise ValueError(f"queue depth {self.depth}; expected at least 1")
+        self._executor = ThreadPoolExecutor(workers) if workers > 1 else None
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Cancel calls not yet started, and wait for the others to finish."""
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Yield `func(item)` for each of `items`, in order, calling ahead of need.
+
+        Exceptions raised by `func` are raised when its result is reached.
+        """
+
+        if self._executor is None:
+            yield from map(func, items)
+            return
+
+        pending: deque[Future[R]] = deque()
+        try:
+            for item in items:
+                if len(pending) >= self.depth:
+                    yield pending.popleft().result()
+                pending.append(self._executor.submit(func, item))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # abandoned by the consumer, or failed; drop the calls not yet started.
+            for future in pending:
+                future.cancel()
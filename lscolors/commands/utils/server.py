@@ -0,0 +1,261 @@
+"""Daemon serving compiled databases over a Unix domain socket, for `lscolors serve`.
+
+The daemon keeps each database it compiles in memory, and recompiles it
+when one of its files changes. Requests and responses are single lines of
+tab-separated fields:
+
+    ping                                    ->  ok
+    ls_colors TERM COLORTERM SOURCE...      ->  ok LS_COLORS
+    color TERM COLORTERM NAME SOURCE...     ->  ok COLOR
+
+where each `SOURCE` is an absolute path of a `dir_colors(5)` file, or
+`builtin:default`, and `COLOR` is that of the extension or pattern matching
+filename `NAME`, as `ls` of coreutils 9.2 matches them, else `fi`. A
+failure is answered with `error MESSAGE`.
+"""
+
+import os
+import socket
+from argparse import Namespace
+from typing import TYPE_CHECKING
+
+from lscolors.commands.utils import cache, default_database
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.database import ColorDatabase
+from lscolors.commands.utils.lru import LRUCache
+
+if TYPE_CHECKING:
+    # not imported at runtime, to keep clients such as `lscolors env` quick to start.
+    import asyncio
+
+# seconds a client waits for the daemon.
+_TIMEOUT = 1.0
+
+# `(mtime_ns, size, ino)` of a file, or None if it cannot be stat'ed.
+_Stamp = tuple[int, int, int] | None
+
+
+def socket_path() -> str:
+    """Return path of the daemon's socket; in `$XDG_RUNTIME_DIR`, else the cache directory."""
+
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or cache.cache_dir(), "lscolors.sock")
+
+
+def client_sources(sources: list[str]) -> list[str] | None:
+    """Return `sources` as named to the daemon, or None if it cannot load them.
+
+    The daemon loads only files and the default database; `-`, `$LS_COLORS`
+    and themes are loaded by the client.
+    """
+
+    named = []
+    for source in sources:
+        if source == default_database.NAME:
+            named.append(source)
+        elif source == "-" or ":" in source:
+            return None
+        else:
+            named.append(os.path.abspath(source))
+    return named
+
+
+def query(*fields: str, path: str | None = None) -> str | None:
+    """Return the daemon's answer to the request of `fields`.
+
+    Return None if no daemon is listening on `path`, default `socket_path()`,
+    or it fails the request, so the client can do the work itself.
+    """
+
+    if any("\t" in x or "\n" in x for x in fields):
+        return None
+    path = path or socket_path()
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(("\t".join(fields) + "\n").encode("utf-8", "surrogateescape"))
+            with sock.makefile("rb") as file:
+                line = file.readline()
+    except OSError:
+        return None
+
+    if not line.endswith(b"\n"):
+        return None
+    status, _, value = line[:-1].decode("utf-8", "surrogateescape").partition("\t")
+    return value if status == "ok" else None
+
+
+class Server:
+    """Compiled databases, kept in memory, and recompiled when their files change."""
+
+    def __init__(self, interval: float = 1.0, maxsize: int = 64) -> None:
+        """Create server, dropping databases whose files changed every `interval` seconds.
+
+        At most `maxsize` databases are kept, the most recently requested;
+        clients choose the sources and terminals, so there is no other bound.
+        """
+
+        self.interval = interval
+        # k=(sources, TERM, COLORTERM), v=(database, `$LS_COLORS`, k=file, v=stamp).
+        self._databases = LRUCache(maxsize)
+
+    def database(
+        self, sources: list[str], term: str, colorterm: str
+    ) -> tuple[ColorDatabase, str]:
+        """Return database compiled from `sources` for the terminal, and its `$LS_COLORS`.
+
+        Raises:
+            RuntimeError: if the database cannot be loaded.
+        """
+
+        key = (tuple(sources), term, colorterm)
+        found: tuple[ColorDatabase, str, dict[str, _Stamp]] | None = self._databases.get(key)
+        if found is not None and _changed(found[2]):
+            # edited since compiled; never answer with the old contents.
+            self._databases.pop(key)
+            found = None
+        if found is None:
+            # stamped first, so a change while compiling is seen when next requested.
+            stamps = {x: _stamp(x) for x in sources if x != default_database.NAME}
+            options = Namespace(
+                dir_colors=list(sources),
+                theme=None,
+                filetypes=None,
+                no_cache=False,
+                lenient=False,
+                prog="serve",
+            )
+            with colors_utils.terminal(term, colorterm):
+                colors, _ = colors_utils.load(options, allow_empty=True)
+            found = (colors, colors.to_ls_colors(), stamps)
+            self._databases.put(key, found)
+        return found[0], found[1]
+
+    def answer(self, request: str) -> str:
+        """Return response line to `request` line, without newlines."""
+
+        command, _, rest = request.partition("\t")
+        fields = rest.split("\t")
+        try:
+            if command == "ping":
+                return "ok"
+            if command == "ls_colors":
+                term, colorterm, *sources = fields
+                if sources:
+                    return "ok\t" + self.database(sources, term, colorterm)[1]
+            elif command == "color":
+                term, colorterm, name, *sources = fields
+                if sources:
+                    colors, _ = self.database(sources, term, colorterm)
+                    entry = colors.match(name, ignore_case=True)
+                    return "ok\t" + (entry.color if entry else colors.get("fi", ""))
+        except ValueError:
+            pass
+        except (RuntimeError, OSError) as err:
+            return "error\t" + " ".join(str(err).split())
+        return f"error\tbad request {command!r}"
+
+    def check(self) -> list[tuple[str, ...]]:
+        """Drop databases whose files have changed; return their sources.
+
+        Requests recompile changed databases themselves; this frees those
+        nobody asks for again.
+        """
+
+        changed = [key for key, (_, _, stamps) in self._databases.items() if _changed(stamps)]
+        for key in changed:
+            self._databases.pop(key)
+        return [x[0] for x in changed]
+
+    async def serve(self, path: str, stop: "asyncio.Event") -> None:
+        """Answer requests on socket `path` until `stop` is set.
+
+        Raises:
+            RuntimeError: if another daemon is listening on `path`.
+        """
+
+        # imported here, as only the daemon needs it.
+        import asyncio  # noqa: PLC0415
+
+        if query("ping", path=path) is not None:
+            raise RuntimeError(f"already serving on {path!r}")
+        if os.path.exists(path):
+            # left by a daemon that did not exit cleanly.
+            os.unlink(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        # created private to the user, not reachable by others even briefly.
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._handle, path)
+        finally:
+            os.umask(umask)
+        watcher = asyncio.ensure_future(self._watch())
+        try:
+            await stop.wait()
+        finally:
+            watcher.cancel()
+            server.close()
+            await server.wait_closed()
+            os.unlink(path)
+
+    async def _handle(
+        self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter"
+    ) -> None:
+        """Answer each request line from a client."""
+
+        try:
+            while line := await reader.readline():
+                request = line.decode("utf-8", "surrogateescape").rstrip("\n")
+                writer.write((self.answer(request) + "\n").encode("utf-8", "surrogateescape"))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # client went away, or sent an overlong line.
+            pass
+        finally:
+            writer.close()
+
+    async def _watch(self) -> None:
+        """Drop databases whose files have changed, every `interval` seconds."""
+
+        # imported here, as only the daemon needs it.
+        import asyncio  # noqa: PLC0415
+
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+
+def run(path: str, interval: float) -> None:
+    """Serve on socket `path` until interrupted or terminated."""
+
+    # imported here, as only the daemon needs them.
+    import asyncio  # noqa: PLC0415
+    import signal  # noqa: PLC0415
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await Server(interval).serve(path, stop)
+
+    asyncio.run(main())
+
+
+def _stamp(path: str) -> _Stamp:
+    """Return stamp of file `path`, which changes when the file does."""
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _changed(stamps: dict[str, _Stamp]) -> bool:
+    """Return whether any of the files of `stamps` has changed since stamped."""
+    return any(_stamp(x) != y for x, y in stamps.items())
@@ -0,0 +1,99 @@
+"""Shell commands setting `$LS_COLORS`, for `lscolors env`.
+
+`eval "$(lscolors env)"` runs at every shell startup, so the output is
+cached, keyed by the shell, terminal and the files it was compiled from,
+and `fast_main` prints it from the cache without building the command
+line parser, or importing anything the `env` command does not need.
+"""
+
+import os
+import sys
+
+from lscolors.commands.utils import cache, default_database
+
+SHELLS = ("sh", "bash", "zsh", "fish", "csh", "tcsh")
+
+
+def default_shell() -> str:
+    """Return shell named by `$SHELL`, as `dircolors(1)` guesses it; default `sh`."""
+
+    shell = os.path.basename(os.environ.get("SHELL", ""))
+    return shell if shell in SHELLS else "sh"
+
+
+def format_env(shell: str, name: str, value: str) -> str:
+    """Return commands for `shell` to set and export environment variable `name` to `value`."""
+
+    if shell == "fish":
+        quoted = "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+        return f"set -gx {name} {quoted};\n"
+
+    quoted = "'" + value.replace("'", "'\\''") + "'"
+    if shell in ("csh", "tcsh"):
+        # `!` is history substitution, even in single quotes.
+        quoted = quoted.replace("!", "\\!")
+        return f"setenv {name} {quoted}\n"
+    return f"{name}={quoted};\nexport {name}\n"
+
+
+def env_key(sources: list[str], shell: str, term: str, colorterm: str) -> str | None:
+    """Return cache key for the output of `lscolors env`, or None if uncacheable.
+
+    Only files and the default database are cacheable; other sources, such
+    as `-` and those with a `scheme:` prefix, are read every time.
+    """
+
+    keys = []
+    for source in sources:
+        try:
+            if source == default_database.NAME:
+                keys.append(cache.file_key(default_database.__file__))
+            elif source == "-" or ":" in source:
+                return None
+            else:
+                keys.append(cache.file_key(source))
+        except OSError:
+            return None
+    return cache.combined_key([*keys, "env", shell, term, colorterm])
+
+
+def fast_main(args: list[str]) -> bool:
+    """Print output of `lscolors env` `args` from the cache, if possible.
+
+    Return True if printed; False if `args` is any other command, or uses
+    options this does not handle, or the output is not cached.
+    """
+
+    if not args or args[0] != "env":
+        return False
+
+    sources = []
+    options = {"--shell": default_shell(), "--term": os.environ.get("TERM") or "none"}
+    args = args[1:]
+    while args:
+        arg = args.pop(0)
+        name, equals, value = arg.partition("=")
+        if name in options:
+            if not equals:
+                if not args:
+                    return False
+                value = args.pop(0)
+            options[name] = value
+        elif arg.startswith("-") and arg != "-":
+            return False
+        else:
+            sources.append(arg)
+
+    if options["--shell"] not in SHELLS:
+        return False
+    key = env_key(
+        sources or [default_database.NAME],
+        options["--shell"],
+        options["--term"],
+        os.environ.get("COLORTERM", ""),
+    )
+    if key is None or (output := cache.get(key)) is None:
+        return False
+
+    sys.stdout.write(output)
+    return True
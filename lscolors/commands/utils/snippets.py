@@ -0,0 +1,76 @@
+"""Shell snippets setting `$LS_COLORS`, written ahead of time for each terminal.
+
+Shell startup sources the snippet for its `$TERM`, without running anything;
+e.g., `. ~/.cache/lscolors/xterm-256color.sh`.
+"""
+
+import os
+from argparse import Namespace
+
+from lscolors.commands.utils import cache, default_database, shellenv
+from lscolors.commands.utils import colors as colors_utils
+
+# k=shell, v=snippet filename extension.
+EXTENSIONS = {"sh": "sh", "bash": "sh", "zsh": "sh", "fish": "fish", "csh": "csh", "tcsh": "csh"}
+
+
+def terms(options: Namespace) -> list[str]:
+    """Return the literal `TERM` values of the sources in `options.dir_colors`, in order.
+
+    `TERM` globs, such as `xterm*`, are skipped.
+    """
+
+    found: list[str] = []
+    for source in options.dir_colors:
+        if source == default_database.NAME:
+            found.extend(default_database.TERMS)
+        elif source != colors_utils.ENV_SOURCE and not source.startswith(
+            (colors_utils.THEME_PREFIX, colors_utils.COMPILED_PREFIX)
+        ):
+            program = colors_utils.load_program(source, options.no_cache, source)
+            found.extend([x for block in program.blocks for x in block[0]])
+
+    return list(dict.fromkeys([x for x in found if _is_literal(x)]))
+
+
+def install(
+    options: Namespace, terms: list[str], shells: list[str], directory: str
+) -> list[str]:
+    """Write a snippet for each of `terms` and `shells` into `directory`.
+
+    Each is compiled from `options`, as by `colors.load`, with `$TERM` set
+    and `$COLORTERM` unset; empty for terminals no `TERM` block matches.
+    Files are replaced atomically, and only when their content changes.
+
+    Return paths of the files written.
+    """
+
+    extensions = {EXTENSIONS[x]: x for x in shells}
+    written = []
+    for term in terms:
+        with colors_utils.terminal(term):
+            colors, _ = colors_utils.load(options, allow_empty=True)
+        ls_colors = colors.to_ls_colors()
+        for extension, shell in extensions.items():
+            path = os.path.join(directory, f"{term}.{extension}")
+            data = shellenv.format_env(shell, "LS_COLORS", ls_colors).encode()
+            if _read(path) != data:
+                cache.write_atomic(path, data)
+                written.append(path)
+
+    return written
+
+
+def _is_literal(term: str) -> bool:
+    """Return True if `term` is not a glob, and is usable as a filename."""
+    return not any(x in term for x in "*?[\\/") and not term.startswith(".")
+
+
+def _read(path: str) -> bytes | None:
+    """Return contents of file `path`, or None if it cannot be read."""
+
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        return None
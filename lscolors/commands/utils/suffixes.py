@@ -0,0 +1,259 @@
+"""Reversed-suffix trie, for matching filenames against extensions and patterns.
+
+`ls` colors a file by the last defined of the extensions and `*` patterns
+its name ends with. The trie holds the suffixes reversed, so a lookup
+walks the name backwards, one character per step, and stops where no
+suffix continues; the cost depends on the length of the name, not on the
+number of suffixes.
+
+`ls` takes the text after the `*` of a pattern literally; `*README*`
+matches names ending with `README*`. Other programs, such as `eza`, take
+patterns as globs; `GlobMatcher` matches names against them, compiled
+once, and gated by a substring search for each pattern's literal text.
+
+Since coreutils 9.0, `ls` ignores the case of suffixes; since 9.2, except
+those listed in several cases with different colors; see `case_rules`.
+Suffixes matched ignoring case are held in a second trie, folded when
+built, whose letters lead to the same node in either case; so lookups
+fold nothing.
+"""
+
+import fnmatch
+import re
+import string
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+# key of a node's `(position, value)`, if a suffix ends there; no character is empty.
+_FOUND = ""
+
+# `c_tolower`; `ls` folds ASCII letters only.
+_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def is_glob(suffix: str) -> bool:
+    """Return True if `suffix` has glob metacharacters."""
+    return any(x in suffix for x in "*?[")
+
+
+def fold(text: str) -> str:
+    """Return `text` with ASCII letters lowercased."""
+    return text.translate(_FOLD)
+
+
+def case_variants(suffixes: Iterable[str]) -> list[list[str]]:
+    """Return groups of `suffixes` that differ only in case, in order."""
+
+    groups = defaultdict(list)
+    for suffix in suffixes:
+        groups[fold(suffix)].append(suffix)
+    return [x for x in groups.values() if len(x) > 1]
+
+
+def case_rules(items: Sequence[tuple[str, str]]) -> list[bool | None]:
+    """Return how `ls` matches each `(suffix, color)` of `items`, in order of definition.
+
+    True to ignore case, False to match exactly, None never; as in
+    `parse_ls_colors` of coreutils 9.2 `ls.c`, which works through the
+    suffixes from the last defined:
+
+        A suffix listed again, in the same case, is superseded.
+        A suffix listed again in another case with the same color is
+            superseded, as are all its other cases listed before that.
+        Otherwise, cases with different colors are matched exactly.
+    """
+
+    rules: list[bool | None] = [True] * len(items)
+    # only suffixes of the same folded text interact; k=folded suffix, v=indexes.
+    groups = defaultdict(list)
+    for i in range(len(items) - 1, -1, -1):
+        groups[fold(items[i][0])].append(i)
+
+    for group in groups.values():
+        for n, i in enumerate(group):
+            if rules[i] is None:
+                continue
+            suffix, color = items[i]
+            case_ignored = False
+            for j in group[n + 1 :]:
+                if rules[j] is None:
+                    continue
+                if items[j][0] == suffix or case_ignored:
+                    rules[j] = None
+                elif items[j][1] == color:
+                    rules[j] = None
+                    case_ignored = True
+                else:
+                    rules[i] = rules[j] = False
+    return rules
+
+
+class SuffixTrie(Generic[T]):
+    """Maps suffixes to values; finds the last defined suffix a name ends with."""
+
+    __slots__ = ("_root", "_folded")
+
+    def __init__(
+        self, items: Sequence[tuple[str, str, T]] = (), ignore_case: bool = False
+    ) -> None:
+        """Create trie of `(suffix, color, value)` `items`, in order of definition.
+
+        With `ignore_case`, match as `ls` of coreutils 9.2 and later does;
+        see `case_rules`. Colors are compared only for that.
+        """
+
+        # k=character, v=node; and k=`_FOUND`, v=(position, value).
+        self._root: dict[str, Any] = {}
+        # the same, for suffixes matched ignoring case.
+        self._folded: dict[str, Any] | None = None
+
+        rules = case_rules([x[:2] for x in items]) if ignore_case else [False] * len(items)
+        for position, ((suffix, _, value), rule) in enumerate(zip(items, rules, strict=True)):
+            if rule is None:
+                continue
+            if not rule:
+                node = self._root
+                for char in reversed(suffix):
+                    node = node.setdefault(char, {})
+            else:
+                if self._folded is None:
+                    self._folded = {}
+                node = self._folded
+                for char in reversed(fold(suffix)):
+                    cases = (char, char.upper()) if char in string.ascii_lowercase else (char,)
+                    child: dict[str, Any] = next((node[x] for x in cases if x in node), {})
+                    for case in cases:
+                        node[case] = child
+                    node = child
+            node[_FOUND] = (position, value)
+
+    def match(self, name: str) -> T | None:
+        """Return value of the last defined suffix `name` ends with, or None."""
+
+        best = _walk(self._root, name)
+        if self._folded is not None:
+            found = _walk(self._folded, name)
+            if found is not None and (best is None or found[0] > best[0]):
+                best = found
+        return None if best is None else best[1]
+
+
+def _walk(node: dict[str, Any], name: str) -> tuple[int, Any] | None:
+    """Return `(position, value)` of the last defined suffix of `name` in trie `node`."""
+
+    best = node.get(_FOUND)
+    for char in reversed(name):
+        child: dict[str, Any] | None = node.get(char)
+        if child is None:
+            break
+        node = child
+        if (found := node.get(_FOUND)) is not None and (best is None or found[0] > best[0]):
+            best = found
+    return best
+
+
+class GlobMatcher(Generic[T]):
+    """Maps glob patterns to values; finds the last defined pattern matching a name.
+
+    Each pattern is compiled once, and tried only on names containing its
+    longest literal run, with one substring search; most names are
+    rejected by most patterns without running a regular expression.
+    """
+
+    __slots__ = ("_patterns",)
+
+    def __init__(self, items: Sequence[tuple[str, T]] = ()) -> None:
+        """Create matcher of `(pattern, value)` `items`, in order of definition."""
+
+        # (literal, match, value), from the last defined; the first that matches wins.
+        self._patterns: list[tuple[str, Callable[[str], Any], T]] = [
+            (_literal(pattern), re.compile(fnmatch.translate(pattern)).match, value)
+            for pattern, value in reversed(items)
+        ]
+
+    def match(self, name: str) -> T | None:
+        """Return value of the last defined pattern matching `name`, or None."""
+
+        for literal, match, value in self._patterns:
+            if literal in name and match(name):
+                return value
+        return None
+
+
+class Matcher(Generic[T]):
+    """Finds the extension or pattern of a database that colors a filename."""
+
+    __slots__ = ("_suffixes", "_globs")
+
+    def __init__(
+        self,
+        items: Sequence[tuple[str, str, T]] = (),
+        ignore_case: bool = False,
+        globs: bool = False,
+    ) -> None:
+        """Create matcher of `(key, color, value)` `items`, in order of definition.
+
+        Args:
+            items: extensions and patterns, keyed as loaded by `colors.load`.
+            ignore_case: match suffixes as `ls` of coreutils 9.2 and later does.
+            globs: match patterns with glob metacharacters as globs, with
+                `GlobMatcher`, rather than literally as `ls` does.
+        """
+
+        suffixes: list[tuple[str, str, tuple[int, T]]] = []
+        patterns: list[tuple[str, tuple[int, T]]] = []
+        for position, (key, color, value) in enumerate(items):
+            suffix = key.removeprefix("*")
+            if globs and is_glob(suffix):
+                patterns.append(("*" + suffix, (position, value)))
+            else:
+                suffixes.append((suffix, color, (position, value)))
+
+        self._suffixes = SuffixTrie(suffixes, ignore_case)
+        self._globs = GlobMatcher(patterns) if patterns else None
+
+    def match(self, name: str) -> T | None:
+        """Return value of the last defined extension or pattern matching `name`, or None."""
+
+        # (position, value)
+        best = self._suffixes.match(name)
+        glob = None if self._globs is None else self._globs.match(name)
+        if glob is not None and (best is None or glob[0] > best[0]):
+            best = glob
+        return None if best is None else best[1]
+
+
+def _literal(pattern: str) -> str:
+    """Return the longest run of literal characters in glob `pattern`.
+
+    Every name `pattern` matches contains it. Bracket expressions are as
+    `fnmatch` parses them; a `[` without a closing `]` is literal.
+    """
+
+    best = run = ""
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char in "*?":
+            run = ""
+        elif char == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j < n:
+                run = ""
+                i = j
+            else:
+                run += char
+        else:
+            run += char
+        best = max(best, run, key=len)
+        i += 1
+    return best
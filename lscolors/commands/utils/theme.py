@@ -0,0 +1,210 @@
+"""Import `vivid(1)` themes.
+
+A theme is a pair of YAML files. The filetypes file is a hierarchy of
+categories, whose leaves list filetypes: `$di` for `di`, `.ext` for
+extensions, and other names for files ending with them; e.g.,
+
+    core:
+      directory: $di
+    text:
+      special: [CHANGELOG, README.md]
+      other: [.txt]
+
+The theme file gives styles, `foreground`, `background` and `font-style`,
+to categories, and names to colors. A category without a style of its
+own inherits its parent's, key by key:
+
+    colors:
+      green: "a6e22e"
+    text:
+      foreground: green
+      special:
+        font-style: bold
+
+Compiled themes are cached, so YAML is parsed only when either file changes.
+"""
+
+import os
+from typing import Any
+
+from lscolors.commands.utils import cache
+
+# `font-style` -> SGR parameter.
+_FONT_STYLES = {
+    "regular": "0",
+    "bold": "1",
+    "faint": "2",
+    "dim": "2",
+    "italic": "3",
+    "underline": "4",
+    "blink": "5",
+    "rapid-blink": "6",
+    "reverse": "7",
+    "inverse": "7",
+    "hidden": "8",
+    "strikethrough": "9",
+}
+
+_STYLE_KEYS = ("foreground", "background", "font-style")
+
+# `RRGGBB`
+_RGB_LENGTH = 6
+
+
+def find_filetypes(theme: str, filetypes: str | None = None) -> str:
+    """Return path of the filetypes file for `theme`.
+
+    Use `filetypes`, if given; else `filetypes.yml` in the directory of
+    `theme` or its parent, as `vivid` installs them, or in `$XDG_CONFIG_HOME/vivid`.
+
+    Raises:
+        RuntimeError: if there is none.
+    """
+
+    if filetypes:
+        return filetypes
+
+    directory = os.path.dirname(os.path.abspath(theme))
+    config = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    for candidate in (directory, os.path.dirname(directory), os.path.join(config, "vivid")):
+        path = os.path.join(candidate, "filetypes.yml")
+        if os.path.exists(path):
+            return path
+
+    raise RuntimeError(f"no `filetypes.yml` for theme {theme!r}; see `--filetypes`")
+
+
+def load(
+    theme: str, filetypes: str, no_cache: bool = False
+) -> tuple[dict[str, str], dict[str, tuple[int, str]]]:
+    """Compile `theme` for the categories in `filetypes`, from cache if possible.
+
+    Return multiple values:
+        colors: dict, colors_by_filetype, k=filetype, v=color; keyed like `colors.load`.
+        lines: dict, k=filetype, v=(0, category), where category is a comment
+            such as `# text.special`.
+
+    Raises:
+        RuntimeError: if either file cannot be read, or is invalid.
+    """
+
+    try:
+        key = (
+            None
+            if no_cache
+            else cache.combined_key([cache.file_key(theme), cache.file_key(filetypes), "theme"])
+        )
+        if key and (cached := cache.get(key)) is not None:
+            return cached[0], {x: (0, y) for x, y in cached[1].items()}
+        styles = _read_yaml(theme)
+        hierarchy = _read_yaml(filetypes)
+    except OSError as err:
+        raise RuntimeError(f"theme; {err}") from err
+
+    if not isinstance(styles, dict) or not isinstance(hierarchy, dict):
+        raise RuntimeError(f"theme {theme!r}; expected mappings in theme and {filetypes!r}")
+
+    palette = styles.get("colors") or {}
+    colors: dict[str, str] = {}
+    categories: dict[str, str] = {}
+    for path, filetype in _leaves(hierarchy, (), filetypes):
+        if (style := _style(styles, path)) is None:
+            continue
+        colors.pop(filetype, None)
+        colors[filetype] = _sgr(style, palette, theme, path)
+        categories[filetype] = "# " + ".".join(path)
+
+    if key:
+        cache.put(key, (colors, categories))
+    return colors, {x: (0, y) for x, y in categories.items()}
+
+
+def _read_yaml(path: str) -> Any:
+    """Return contents of YAML file `path`, with all scalars as strings."""
+
+    # imported here, as only themes need it.
+    import yaml  # noqa: PLC0415
+
+    with open(path, encoding="utf-8") as file:
+        try:
+            return yaml.load(file, Loader=getattr(yaml, "CBaseLoader", yaml.BaseLoader))
+        except yaml.YAMLError as err:
+            raise RuntimeError(f"theme; {path}: {err}") from err
+
+
+def _leaves(
+    node: Any, path: tuple[str, ...], filetypes: str
+) -> list[tuple[tuple[str, ...], str]]:
+    """Return `(category path, filetype)` of each filetype in hierarchy `node`.
+
+    Raises:
+        RuntimeError: if a list of filetypes in file `filetypes` holds a list or mapping.
+    """
+
+    if isinstance(node, dict):
+        return [
+            leaf
+            for name, child in node.items()
+            for leaf in _leaves(child, (*path, name), filetypes)
+        ]
+
+    leaves = []
+    for name in [node] if isinstance(node, str) else node or []:
+        if not isinstance(name, str):
+            raise RuntimeError(
+                f"theme; {filetypes}: expected filetype names in {'.'.join(path)}, not {name!r}"
+            )
+        if name.startswith("$"):
+            filetype = name[1:]
+        elif name.startswith("."):
+            filetype = name
+        else:
+            filetype = "*" + name
+        leaves.append((path, filetype))
+    return leaves
+
+
+def _style(styles: dict[str, Any], path: tuple[str, ...]) -> dict[str, str] | None:
+    """Return style of category `path`, inherited key by key; None if it has none."""
+
+    style: dict[str, str] | None = None
+    node: Any = styles
+    for name in path:
+        if not isinstance(node, dict) or not isinstance(node := node.get(name), dict):
+            break
+        style = dict(style or {})
+        style.update({x: node[x] for x in _STYLE_KEYS if x in node})
+    return style
+
+
+def _sgr(
+    style: dict[str, str], palette: dict[str, str], theme: str, path: tuple[str, ...]
+) -> str:
+    """Return SGR parameters for `style`, with 24-bit colors."""
+
+    params = []
+
+    font_styles: str | list[str] = style.get("font-style") or []
+    for font_style in [font_styles] if isinstance(font_styles, str) else font_styles:
+        if (param := _FONT_STYLES.get(font_style)) is None:
+            raise RuntimeError(
+                f"theme {theme!r}; unknown font-style {font_style!r} in {'.'.join(path)}"
+            )
+        params.append(param)
+
+    for key, selector in (("foreground", "38"), ("background", "48")):
+        if (color := style.get(key)) is not None:
+            rgb = palette.get(color, color).removeprefix("#")
+            try:
+                if len(rgb) != _RGB_LENGTH:
+                    raise ValueError(rgb)
+                red, green, blue = (int(rgb[i : i + 2], 16) for i in (0, 2, 4))
+            except ValueError as err:
+                raise RuntimeError(
+                    f"theme {theme!r}; unknown color {color!r} in {'.'.join(path)}"
+                ) from err
+            params.append(f"{selector};2;{red};{green};{blue}")
+
+    return ";".join(params) or "0"
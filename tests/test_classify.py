@@ -0,0 +1,207 @@
+import io
+import os
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from lscolors.cli import main
+from lscolors.commands import classify as classify_cmd
+from lscolors.commands.utils.classify import (
+    CAPABILITY,
+    DIRECTORY,
+    REGULAR,
+    TARGET,
+    Classifier,
+    FileInfo,
+)
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERM", "xterm")
+    monkeypatch.delenv("COLORTERM", raising=False)
+
+
+REG = stat.S_IFREG | 0o644
+DIR = stat.S_IFDIR | 0o755
+LNK = stat.S_IFLNK | 0o777
+
+
+@pytest.mark.parametrize(
+    ("colors", "info", "expected"),
+    [
+        # defaults.
+        ({}, FileInfo("x", DIR), "01;34"),
+        ({}, FileInfo("x", REG), None),
+        ({}, FileInfo("x", REG | stat.S_ISUID | 0o111), "37;41"),
+        ({"su": "00"}, FileInfo("x", REG | stat.S_ISUID | 0o111), "01;32"),
+        ({}, FileInfo("x", DIR | stat.S_ISVTX | stat.S_IWOTH), "30;42"),
+        ({"tw": "0"}, FileInfo("x", DIR | stat.S_ISVTX | stat.S_IWOTH), "34;42"),
+        # exec before multiple hard links.
+        ({"mh": "44"}, FileInfo("x", REG | 0o111, nlink=2), "01;32"),
+        ({"mh": "44"}, FileInfo("x", REG, nlink=2), "44"),
+        ({"ca": "30;41"}, FileInfo("x", REG | 0o111, capability=True), "30;41"),
+        # extensions only for plain files; last definition wins.
+        ({".gz": "31", "*z": "32"}, FileInfo("a.gz", REG), "32"),
+        ({"*z": "32", ".gz": "31"}, FileInfo("a.gz", REG), "31"),
+        ({".gz": "31"}, FileInfo("a.gz", REG | 0o111), "01;32"),
+        ({".gz": "31", "fi": "36"}, FileInfo("a.tgz", REG), "36"),
+        # only the filetype known, as from `d_type`.
+        ({".gz": "31"}, FileInfo("a.gz", stat.S_IFREG, stat_ok=False), "31"),
+        ({}, FileInfo("x", 0, stat_ok=False), None),
+        ({"or": "31"}, FileInfo("x", 0, stat_ok=False), "31"),
+        # symbolic links.
+        ({}, FileInfo("x", LNK), "01;36"),
+        ({"or": "31"}, FileInfo("x", LNK), "31"),
+        ({"or": "31"}, FileInfo("x", LNK, linkok=True, linkmode=DIR), "01;36"),
+        ({"ln": "target"}, FileInfo("x", LNK, linkok=True, linkmode=DIR), "01;34"),
+        ({"ln": "target", ".gz": "31"}, FileInfo("a.gz", LNK, linkok=True, linkmode=REG), "31"),
+        ({"ln": "target"}, FileInfo("x", LNK), None),
+    ],
+)
+def test_color(colors: dict[str, str], info: FileInfo, expected: str | None) -> None:
+    assert Classifier(colors).color(info) == expected
+
+
+def test_classify(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("a.gz").touch()
+    Path("exe").touch(mode=0o755)
+    os.mkfifo("fifo")
+    os.symlink("exe", "link")
+    os.symlink("missing", "orphan")
+
+    classifier = Classifier({"or": "40;31;01", ".gz": "01;31", "ln": "target"})
+    assert [classifier.classify(x) for x in ["a.gz", "exe", "fifo", "link", "orphan"]] == [
+        "01;31",
+        "01;32",
+        "33",
+        "01;32",
+        "40;31;01",
+    ]
+    assert classifier.classify("nonexistent") == "40;31;01"
+    with os.scandir(".") as entries:
+        assert {x.name: classifier.classify(x) for x in entries}["link"] == "01;32"
+    assert classifier.classify("a.gz", os.lstat("exe")) == "01;32"
+
+
+def test_match_cache() -> None:
+    classifier = Classifier({".gz": "31"}, cache_size=2)
+    assert classifier.match("a.gz") == "31"
+    assert classifier.match("dir/a.gz") == "31"
+    assert classifier.match("b") is None
+    assert classifier.match("b") is None
+    assert (classifier.cache.hits, classifier.cache.misses) == (2, 2)
+    assert classifier.match("c") is None
+    assert classifier.cache.evictions == 1
+    assert classifier.cache.stats() == (
+        "2 hits, 3 misses (40.0% hit rate), 1 evictions; 2/2 entries"
+    )
+
+
+def test_match_no_cache() -> None:
+    classifier = Classifier({".gz": "31"}, cache_size=0)
+    assert [classifier.match("a.gz") for _ in range(2)] == ["31", "31"]
+    assert (len(classifier.cache), classifier.cache.hits) == (0, 0)
+
+
+def test_needs_stat() -> None:
+    assert Classifier({}).needs_stat
+    plain = dict.fromkeys(["di", "ln", "pi", "so", "bd", "cd", "do", "ex"], "0")
+    plain |= dict.fromkeys(["su", "sg", "st", "ow", "tw"], "0")
+    assert not Classifier(plain | {".gz": "31"}).needs_stat
+    assert Classifier(plain | {"mh": "44"}).needs_stat
+
+
+def test_read_paths(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(classify_cmd, "_BUFSIZE", 3)
+    paths = list(classify_cmd._read_paths(io.BytesIO(b"abcd\0\0e\0fgh")))
+    assert [x for chunk in paths for x in chunk] == [b"abcd", b"e", b"fgh"]
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ([], b"\x1b[31ma.gz\x1b[0m\n\x1b[01;34md\x1b[0m\nx\n"),
+        (["--sgr", "-z"], b"a.gz\t31\0d\t01;34\0x\t\0"),
+        (
+            ["--workers", "4", "--queue-depth", "1"],
+            b"\x1b[31ma.gz\x1b[0m\n\x1b[01;34md\x1b[0m\nx\n",
+        ),
+    ],
+)
+def test_classify_cmd(
+    capsysbinary: pytest.CaptureFixture[bytes],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    args: list[str],
+    expected: bytes,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("a.gz").touch()
+    Path("d").mkdir()
+    Path("x").touch()
+    monkeypatch.setenv("LS_COLORS", "*.gz=31:")
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"a.gz\0d\0x\0")))
+    main(["classify", *args])
+    assert capsysbinary.readouterr().out == expected
+
+
+def test_plan() -> None:
+    plan = Classifier({}).plan
+    assert plan.reasons[REGULAR] == ["su", "sg", "ex"]
+    assert plan.reasons[DIRECTORY] == ["tw", "ow", "st"]
+    assert TARGET not in plan
+    assert CAPABILITY not in plan
+    assert Classifier({"ln": "target"}).plan.reasons[TARGET] == ["ln"]
+    assert Classifier({"or": "31", "ca": "30;41"}).plan.reasons[TARGET] == ["or"]
+    assert CAPABILITY in Classifier({"ca": "30;41"}).plan
+
+
+def test_walk_d_type(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("d").mkdir()
+    Path("d/exe").touch(mode=0o755)
+    Path("a.gz").touch()
+    os.symlink("d", "link")
+    uncolored = dict.fromkeys(["su", "sg", "ex", "st", "ow", "tw"], "0")
+
+    for colors in [{".gz": "31"}, uncolored | {".gz": "31"}]:
+        classifier = Classifier(colors)
+        walked = dict(classifier.walk("."))
+        assert walked == {x: classifier.classify(x) for x in walked}
+        assert sorted(walked) == ["./a.gz", "./d", "./d/exe", "./link"]
+
+    # only the filetype, from `d_type`.
+    with os.scandir(".") as it:
+        assert not any(classifier.probe(x).stat_ok for x in it)
+
+
+def test_plan_cmd(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LS_COLORS", "ex=01;31:mh=44:")
+    main(["plan"])
+    lines = capsys.readouterr().out.splitlines()
+    assert "lstat regular files: ex=01;31 [env:LS_COLORS]" in lines
+    assert "lstat regular files: su=37;41 [ls default]" in lines
+    assert "lstat regular files: mh=44 [env:LS_COLORS]" in lines
+
+
+def test_classify_cmd_broken_pipe(tmp_path: Path) -> None:
+    env = os.environ | {"LS_COLORS": "*.gz=31:", "XDG_CACHE_HOME": str(tmp_path / "cache")}
+    with subprocess.Popen(
+        [sys.executable, "-m", "lscolors", "classify"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    ) as proc:
+        # the reader goes away, as `head` does.
+        assert proc.stdout
+        proc.stdout.close()
+        _, stderr = proc.communicate(b"a.gz\0" * 1_000_000)
+    assert stderr == b""
+    assert proc.returncode == 1
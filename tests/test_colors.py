@@ -0,0 +1,245 @@
+import os
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from lscolors.commands.utils import cache, database, default_database, dircolors
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils.database import ColorDatabase
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERM", "xterm")
+    monkeypatch.delenv("COLORTERM", raising=False)
+
+
+def _options(*dir_colors: str, no_cache: bool = False, lenient: bool = False) -> Namespace:
+    return Namespace(
+        dir_colors=list(dir_colors),
+        theme=None,
+        filetypes=None,
+        no_cache=no_cache,
+        lenient=lenient,
+        prog="test",
+    )
+
+
+def test_load_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LS_COLORS", "di=01;34:*.gz=31:*README=04:")
+    colors, meta = colors_utils.load(_options())
+    assert colors == {"di": "01;34", ".gz": "31", "*README": "04"}
+    assert meta == "env=$LS_COLORS"
+
+
+def test_load_missing_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("LS_COLORS", raising=False)
+    with pytest.raises(RuntimeError, match="missing"):
+        colors_utils.load(_options())
+
+
+def test_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    path = tmp_path / "dir_colors"
+    path.write_text("TERM xterm\nDIR 01;34\n.gz 31\n", encoding="utf-8")
+
+    colors, _ = colors_utils.load(_options(str(path)))
+    assert colors == {"di": "01;34", ".gz": "31"}
+    # parsed file, signature for this terminal, compiled database.
+    assert len(os.listdir(cache.cache_dir())) == 3
+
+    # found without reading the parsed file.
+    with monkeypatch.context() as patch:
+        patch.setattr(dircolors.Program, "from_value", None)
+        assert colors_utils.load(_options(str(path)))[0] == colors
+
+    # served from cache; poison the entry to prove the file is not recompiled.
+    key = cache.combined_key([cache.file_key(str(path)), "0,1"])
+    cache.put(key, ({"di": "cached"}, [(0, 0, "")]))
+    assert colors_utils.load(_options(str(path)))[0] == {"di": "cached"}
+    assert colors_utils.load(_options(str(path), no_cache=True))[0]["di"] == "01;34"
+
+    # a change in content invalidates the entry; of the same size, seen by the mtime.
+    path.write_text("TERM xterm\nDIR 01;35\n.gz 31\n", encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    assert colors_utils.load(_options(str(path)))[0]["di"] == "01;35"
+    path.write_text("TERM xterm\nDIR 1;36\n.gz 31\n", encoding="utf-8")
+    assert colors_utils.load(_options(str(path)))[0]["di"] == "1;36"
+
+
+def test_cache_term(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    path = tmp_path / "dir_colors"
+    path.write_text(
+        "TERM xterm*\nTERM screen*\nDIR 01;34\nTERM linux\nDIR 01;35\n", encoding="utf-8"
+    )
+    assert colors_utils.load(_options(str(path)))[0] == {"di": "01;34"}
+    monkeypatch.setenv("TERM", "linux")
+    assert colors_utils.load(_options(str(path)))[0] == {"di": "01;35"}
+    # parsed file, two signatures, two compiled databases.
+    assert len(os.listdir(cache.cache_dir())) == 5
+
+    # same blocks enabled; same compiled database, and a signature per terminal.
+    for term in ["xterm-256color", "screen"]:
+        monkeypatch.setenv("TERM", term)
+        assert colors_utils.load(_options(str(path)))[0] == {"di": "01;34"}
+    assert len(os.listdir(cache.cache_dir())) == 7
+
+
+def test_cache_corrupt() -> None:
+    key = cache.text_key("x")
+    cache.put(key, {"a": "b"})
+    assert cache.get(key) == {"a": "b"}
+    Path(cache.cache_dir(), key).write_bytes(b"garbage")
+    assert cache.get(key) is None
+
+
+def test_parse() -> None:
+    colors, errors = colors_utils.parse(
+        "::rs=0:di=01;34:ln=target:lc=\\e[:*.gz=31:*~=00;90:ö=1:*.x=1=2:di:zz=1:*.y=red:"
+    )
+    assert colors == {
+        "rs": "0",
+        "di": "01;34",
+        "ln": "target",
+        "lc": "\\e[",
+        ".gz": "31",
+        "*~": "00;90",
+    }
+    assert errors == [
+        "byte 50: unrecognized filetype 'ö' in 'ö=1'",
+        "byte 55: unexpected `=` in '*.x=1=2'",
+        "byte 63: missing `=` in 'di'",
+        "byte 66: unrecognized filetype 'zz' in 'zz=1'",
+        "byte 71: invalid SGR sequence 'red' in '*.y=red'",
+    ]
+
+
+def test_load_strict(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("LS_COLORS", "di=01;34:bogus:*.gz=31")
+    with pytest.raises(RuntimeError, match="byte 9: missing `=` in 'bogus'"):
+        colors_utils.load(_options())
+
+    colors, _ = colors_utils.load(_options(lenient=True))
+    assert colors == {"di": "01;34", ".gz": "31"}
+    assert "warning; byte 9" in capsys.readouterr().err
+
+
+def test_load_colon(tmp_path: Path) -> None:
+    # would split the `$LS_COLORS` entry.
+    path = tmp_path / "dir_colors"
+    path.write_text("TERM xterm\n.a:b 31\n", encoding="utf-8")
+    with pytest.raises(RuntimeError, match=f"^{path}:2: unrecognized filetype '\\*.a:b'\n"):
+        colors_utils.load(_options(str(path)))
+
+
+def test_database() -> None:
+    colors = ColorDatabase({"di": "01;34", ".gz": "1;34", "*README": "04", "ln": "target"})
+    assert colors == {"di": "01;34", ".gz": "1;34", "*README": "04", "ln": "target"}
+    assert [x.key for x in colors.entries(database.EXTENSION)] == [".gz"]
+    assert [x.key for x in colors.entries(database.GLOB)] == ["*README"]
+
+    di, gz = colors.entry("di"), colors.entry(".gz")
+    assert di
+    assert gz
+    assert di.kind == database.FILETYPE
+    assert di.codes == (1, 34)
+    assert di.codes is gz.codes
+    assert di.escape == "\x1b[01;34m"
+
+    ln = colors.entry("ln")
+    assert ln
+    assert ln.codes == ()
+    assert ln.escape == ""
+    assert database.format_codes(di.codes) == "001-034"
+
+
+def test_load_default_database(monkeypatch: pytest.MonkeyPatch) -> None:
+    colors, meta = colors_utils.load(_options("builtin:default"))
+    assert colors["di"] == "01;34"
+    assert meta == "dir_colors='builtin:default'"
+
+    monkeypatch.setenv("TERM", "dumb")
+    with pytest.raises(RuntimeError, match="empty database"):
+        colors_utils.load(_options("builtin:default"))
+    # as `dircolors`; cached, and still an error for callers not allowing it.
+    assert not colors_utils.load(_options("builtin:default"), allow_empty=True)[0]
+    assert not colors_utils.load(_options("builtin:default"), allow_empty=True)[0]
+    with pytest.raises(RuntimeError, match="empty database"):
+        colors_utils.load(_options("builtin:default"))
+    monkeypatch.setenv("COLORTERM", "truecolor")
+    assert colors_utils.load(_options("builtin:default"))[0]["di"] == "01;34"
+
+
+def test_default_database_source() -> None:
+    compiled = dircolors.compile_lines(default_database.SOURCE.splitlines(), term="xterm")
+    assert colors_utils.parse(compiled) == (default_database.COLORS, [])
+
+
+def test_load_layers(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    site = tmp_path / "site"
+    site.write_text("DIR 01;34\n.gz 31\n.tar 31\n", encoding="utf-8")
+    user = tmp_path / "user"
+    user.write_text(".gz 32\n*README 04\n", encoding="utf-8")
+    monkeypatch.setenv("LS_COLORS", "di=01;35")
+
+    for _ in range(2):  # compile, then from cache
+        colors, meta = colors_utils.load(_options(str(site), str(user), "env:LS_COLORS"))
+        assert colors == {"di": "01;35", ".gz": "32", ".tar": "31", "*README": "04"}
+        assert {x.key: x.source for x in colors.entries()} == {
+            "di": "env:LS_COLORS",
+            ".gz": str(user),
+            ".tar": str(site),
+            "*README": str(user),
+        }
+        assert meta == f"dir_colors={[str(site), str(user), 'env:LS_COLORS']!r}"
+    # two parsed files and their signatures, and the compiled database.
+    assert len(os.listdir(cache.cache_dir())) == 5
+
+
+def test_load_provenance(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    path = tmp_path / "dir_colors"
+    path.write_text(
+        "\n".join(
+            [
+                "TERM xterm",
+                "# directories",
+                "DIR 01;34",
+                "",
+                "# archives",
+                "# (bright red)",
+                ".tar 01;31",
+                "#.cmd 01;32",
+                ".gz 01;31",
+                ".bad red",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(RuntimeError, match=f"^{path}:10: invalid SGR sequence 'red'\n"):
+        colors_utils.load(_options(str(path)))
+
+    colors, _ = colors_utils.load(_options("builtin:default", str(path), lenient=True))
+    where = {x.key: (x.where, x.comment) for x in colors.entries()}
+    assert where[".gz"] == (f"{path}:9", "# archives")
+    # not cached, having errors; loaded again from the sources.
+    with monkeypatch.context() as patch:
+        patch.setattr(colors_utils, "_load_source", None)
+        with pytest.raises(TypeError):
+            colors_utils.load(_options("builtin:default", str(path), lenient=True))
+
+    # without the error; compile, then from cache, without loading any source.
+    path.write_text(path.read_text(encoding="utf-8").replace(".bad red", ""), encoding="utf-8")
+    for cached in [False, True]:
+        with monkeypatch.context() as patch:
+            if cached:
+                patch.setattr(colors_utils, "_load_source", None)
+            colors, _ = colors_utils.load(_options("builtin:default", str(path)))
+        where = {x.key: (x.where, x.comment) for x in colors.entries()}
+        assert where["di"] == (f"{path}:3", "# directories")
+        assert where[".tar"] == (f"{path}:7", "# archives")
+        assert where[".gz"] == (f"{path}:9", "# archives")
+        assert where[".zip"] == ("builtin:default:96", " # archives or compressed (bright red)")
@@ -0,0 +1,67 @@
+import mmap
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lscolors.cli import main
+from lscolors.commands.utils import default_database
+from lscolors.commands.utils.compiled import CompiledDatabase, dumps
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERM", "xterm")
+
+
+def test_compiled_database(tmp_path: Path) -> None:
+    colors = {"di": "01;34", ".gz": "01;31", "*README": "01;31", "ln": "target", ".tar": "01;31"}
+    data = dumps(colors)
+    # one copy of each distinct color.
+    assert data.count(b"01;31") == 1
+
+    path = tmp_path / "colors.db"
+    path.write_bytes(data)
+    database = CompiledDatabase(str(path))
+    assert list(database) == list(colors)
+    assert dict(database) == colors
+    assert database[".gz"] == "01;31"
+    assert "fi" not in database
+    with pytest.raises(KeyError):
+        database[".zip"]  # noqa: B018
+    database.close()
+
+
+def test_invalid(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # every map is closed, even when the file is rejected.
+    maps: list[mmap.mmap] = []
+    real = mmap.mmap
+
+    def record(*args: Any, **kwargs: Any) -> mmap.mmap:
+        maps.append(real(*args, **kwargs))
+        return maps[-1]
+
+    monkeypatch.setattr(mmap, "mmap", record)
+
+    path = tmp_path / "colors.db"
+    path.write_bytes(b"")
+    with pytest.raises(RuntimeError, match="not a compiled database"):
+        CompiledDatabase(str(path))
+    path.write_bytes(dumps({"di": "01;34"})[:-3])
+    with pytest.raises(RuntimeError, match="corrupt"):
+        CompiledDatabase(str(path))
+    path.write_bytes(b"XXXX" + dumps({"di": "01;34"})[4:])
+    with pytest.raises(RuntimeError, match="not a compiled database"):
+        CompiledDatabase(str(path))
+    assert len(maps) == 2
+    assert all(x.closed for x in maps)
+
+
+def test_compile(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    path = tmp_path / "colors.db"
+    main(["compile", "-o", str(path), default_database.NAME])
+    main(["minify", default_database.NAME])
+    expected = capsys.readouterr().out
+    main(["minify", f"compiled:{path}"])
+    assert capsys.readouterr().out == expected
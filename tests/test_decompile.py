@@ -0,0 +1,39 @@
+from lscolors.commands.paint import ColorGroup
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import default_database, dircolors
+from lscolors.commands.utils.database import ColorDatabase
+from lscolors.commands.utils.decompile import decompile
+
+
+def _compile(lines: list[str]) -> dict[str, str]:
+    colors, errors = colors_utils.parse(dircolors.compile_lines(lines, term="xterm"))
+    assert not errors
+    return colors
+
+
+def test_decompile_default_database() -> None:
+    colors = ColorDatabase(default_database.COLORS)
+    lines = decompile(colors, comments=ColorGroup.comments())
+    assert _compile(lines) == default_database.COLORS
+    assert "DIR 01;34  # Directory" in lines
+    # grouped under the comment `paint` recognizes, from the default database.
+    archives = lines.index(" # archives or compressed (bright red)")
+    assert ColorGroup.get_by_comment(lines[archives]) is not None
+    assert lines[archives + 1] == ".tar 01;31"
+
+
+def test_decompile_overlapping() -> None:
+    colors, _ = colors_utils.parse("*.gz=31:*.tar.gz=32:*.gz=33:*.c=1:*README=2:*.md=2:*ME=4")
+    lines = decompile(ColorDatabase(colors))
+    assert _compile(lines) == colors
+    # `ls` applies the last matching pattern; `.gz` is redefined after `.tar.gz`.
+    assert lines.index(".tar.gz 32") < lines.index(".gz 33")
+    assert lines.index("*README 2") < lines.index("*ME 4")
+    assert lines[-2:] == ["# 2", ".md 2"]
+
+
+def test_decompile_comments() -> None:
+    colors, _ = colors_utils.parse("*.tar=01;31:*.zip=01;31")
+    assert "# 01;31" in decompile(ColorDatabase(colors))
+    comments = [" # archives or compressed (bright red)"]
+    assert comments[0] in decompile(ColorDatabase(colors), comments=comments)
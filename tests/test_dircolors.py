@@ -0,0 +1,92 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lscolors.commands.utils import dircolors
+
+SAMPLE = Path(__file__).parent.parent / "lscolors" / "sample-configs" / ".dircolors"
+
+
+def _system_dircolors(path: Path, term: str, colorterm: str) -> str:
+    proc = subprocess.run(
+        ["dircolors", "--bourne-shell", str(path)],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={"TERM": term, "COLORTERM": colorterm},
+    )
+    return proc.stdout.strip()[len("LS_COLORS='") : -len("';\nexport LS_COLORS")]
+
+
+@pytest.mark.skipif(not shutil.which("dircolors"), reason="no system dircolors")
+@pytest.mark.parametrize(
+    ("term", "colorterm"),
+    [
+        ("xterm-256color", ""),
+        ("linux", ""),
+        ("dumb", ""),
+        ("dumb", "truecolor"),
+        ("none", ""),
+    ],
+)
+def test_matches_system_dircolors(term: str, colorterm: str) -> None:
+    expected = _system_dircolors(SAMPLE, term, colorterm)
+    assert dircolors.compile_file(str(SAMPLE), term, colorterm) == expected
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("", (None, None)),
+        ("   # comment", (None, None)),
+        ("DIR", ("DIR", None)),
+        ("DIR   # comment", ("DIR", None)),
+        ("  DIR \t 01;34  # directory", ("DIR", "01;34")),
+        (".tar\t01;31", (".tar", "01;31")),
+    ],
+)
+def test_parse_line(line: str, expected: tuple[str | None, str | None]) -> None:
+    assert dircolors.parse_line(line) == expected
+
+
+def test_term_gating() -> None:
+    lines = [
+        "RESET 0",
+        "TERM xterm*",
+        "COLORTERM ?*",
+        "dir 01;34",
+        "*README 04",
+        "TERM linux",
+        ".gz 31",
+        "OPTIONS -F",
+    ]
+    assert dircolors.compile_lines(lines, term="xterm", colorterm="") == (
+        "rs=0:di=01;34:*README=04:"
+    )
+    assert dircolors.compile_lines(lines, term="dumb", colorterm="truecolor") == (
+        "rs=0:di=01;34:*README=04:"
+    )
+    assert dircolors.compile_lines(lines, term="linux", colorterm="") == "rs=0:*.gz=31:"
+    assert dircolors.compile_lines(lines, term="dumb", colorterm="") == "rs=0:"
+
+
+def test_errors() -> None:
+    # like `dircolors`, unrecognized keywords are only reported after a matching `TERM`.
+    lines = ["DIR", "BOGUS 01", "TERM xterm", "BOGUS2 01"]
+    with pytest.raises(RuntimeError, match=r"^x:1: invalid line;.*\nx:4: [a-z ]+ BOGUS2$"):
+        dircolors.compile_lines(lines, filename="x", term="xterm")
+
+
+def test_program_signature() -> None:
+    program = dircolors.Program.parse(
+        ["RESET 0", "TERM xterm*", "TERM screen*", "DIR 01;34", "COLORTERM ?*", ".gz 31"]
+    )
+    assert program.signature("xterm-256color", "") == "0,1"
+    assert program.signature("screen", "truecolor") == "0,1,2"
+    assert program.signature("linux", "") == "0"
+    assert program.compile("0,1,2") == "rs=0:di=01;34:*.gz=31:"
+
+    value = program.to_value()
+    assert dircolors.Program.from_value(value).to_value() == value
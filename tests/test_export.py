@@ -0,0 +1,55 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from lscolors.commands.utils import cache, colors, default_database
+from lscolors.commands.utils.database import ColorDatabase
+from lscolors.commands.utils.export import export, shell_lines
+
+
+@pytest.fixture(autouse=True)
+def _environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("TERM", "xterm")
+
+
+def test_export() -> None:
+    database = ColorDatabase(
+        colors.parse("di=00;01;34:ln=target:ex=38;5;9:lc=\\e[:*.tar=01;31:*README=33")[0]
+    )
+    exported = export(database)
+    assert exported["ls"] == "di=0;1;34:ln=target:ex=38;5;9:lc=\\e[:*.tar=1;31:*README=33"
+    assert exported["fd"] == exported["tree"] == exported["ls"]
+    assert exported["exa"] == "di=0;1;34:ex=38;5;9:*.tar=1;31:*README=33"
+    assert exported["zsh"] == "di=0;1;34:ex=38;5;9:lc=\\e[:*.tar=1;31:*README=33"
+    # missing filetypes have the colors GNU `ls` gives them.
+    assert exported["bsd"] == "ExGxFxdxBxDxDxhbadacec"
+
+
+def test_export_default_database() -> None:
+    exported = export(ColorDatabase(default_database.COLORS), ("bsd",))
+    assert exported == {"bsd": "ExGxFxdaCxDaDahbadacec"}
+
+
+def test_shell_lines() -> None:
+    database = ColorDatabase({"di": "01;34", ".tar": "01;31"})
+    assert shell_lines(export(database, ("ls", "fd", "zsh"))) == [
+        "export LS_COLORS='di=1;34:*.tar=1;31'",
+        "zstyle ':completion:*' list-colors 'di=1;34' '*.tar=1;31'",
+    ]
+
+
+def test_export_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LS_COLORS", "di=01;34")
+    options = Namespace(
+        dir_colors=[], theme=None, filetypes=None, no_cache=False, lenient=False, prog="test"
+    )
+    database, _ = colors.load(options)
+    assert database.fingerprint
+    assert export(database, ("ls",)) == {"ls": "di=1;34"}
+
+    key = cache.combined_key([database.fingerprint, "export", "ls"])
+    cache.put(key, {"ls": "cached"})
+    assert export(database, ("ls",)) == {"ls": "cached"}
+    assert export(database, ("ls",), no_cache=True) == {"ls": "di=1;34"}
@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from lscolors.commands.utils.links import MAXSYMLINKS, LinkResolver
+
+
+@pytest.fixture(autouse=True)
+def _chdir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+
+
+def _stat(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def test_target() -> None:
+    Path("d").mkdir()
+    Path("f").touch()
+    os.symlink("d", "s")
+    os.symlink("../f", "d/up")
+    os.symlink("./d/../f", "dotdot")
+    os.symlink("up", "d/up2")
+    os.symlink("nowhere", "missing")
+    os.symlink("loop1", "loop2")
+    os.symlink("loop2", "loop1")
+    os.symlink("self", "self")
+    os.symlink(os.path.abspath("f"), "absolute")
+    os.symlink("f/x", "notdir")
+
+    resolver = LinkResolver()
+    for path in ["f", "d", "s", "d/up", "s/up", "s/up2", "dotdot", "missing", "loop1", "loop2"]:
+        target = resolver.target(path)
+        assert (target and (target.st_dev, target.st_ino)) == _stat(path)
+    for path in ["self", "absolute", "notdir", "nonexistent"]:
+        target = resolver.target(path)
+        assert (target and (target.st_dev, target.st_ino)) == _stat(path)
+
+
+def test_shared_chains() -> None:
+    Path("f").touch()
+    os.symlink("f", "l1")
+    os.symlink("l1", "l2")
+    os.symlink("l2", "l3")
+    for i in range(10):
+        os.symlink("l3", f"farm{i}")
+
+    resolver = LinkResolver()
+    assert all(resolver.target(f"farm{i}") for i in range(10))
+    # each link read once.
+    assert resolver.readlinks == 13
+    assert resolver.target("l2")
+    assert resolver.readlinks == 13
+
+    resolver.clear()
+    assert resolver.target("l2")
+    assert resolver.readlinks == 15
+
+
+def test_long_chain() -> None:
+    Path("f").touch()
+    os.symlink("f", "l0")
+    for i in range(1, MAXSYMLINKS + 1):
+        os.symlink(f"l{i - 1}", f"l{i}")
+
+    resolver = LinkResolver()
+    assert resolver.target(f"l{MAXSYMLINKS - 1}")
+    assert LinkResolver().target(f"l{MAXSYMLINKS}") is None
+    assert _stat(f"l{MAXSYMLINKS}") is None
@@ -8,11 +8,20 @@ from lscolors.cli import main
     [
         ("chart"),
         ("check"),
+        ("classify"),
+        ("compile"),
         ("configs"),
+        ("decompile"),
         ("docs"),
+        ("env"),
+        ("export"),
+        ("install-snippets"),
+        ("minify"),
         ("paint"),
+        ("plan"),
         ("report"),
         ("samples"),
+        ("serve"),
         ("sort"),
     ],
 )
@@ -0,0 +1,69 @@
+import pytest
+
+from lscolors.commands.utils import default_database
+from lscolors.commands.utils.colors import parse
+from lscolors.commands.utils.minify import minify, normalize
+
+
+@pytest.mark.parametrize(
+    ("color", "expected"),
+    [
+        ("01;34", "1;34"),
+        ("01;034", "1;34"),
+        ("00;01;34", "0;1;34"),
+        ("00;01;034;1", "0;1;34"),
+        ("1;31;32", "1;32"),
+        ("00", "0"),
+        ("0;1;0;31", "0;31"),
+        ("1;22;1", "22;1"),
+        ("0;39;49", "0"),
+        ("38;5;208;01", "1;38;5;208"),
+        ("38;2;0;95;255;48;5;0", "38;2;0;95;255;48;5;0"),
+        ("4;58;5;1;59", "4;59"),
+        # not modeled; cleaned up in order.
+        ("01;21;21;1", "1;21;1"),
+        ("1;0;21", "0;21"),
+        # malformed.
+        ("38;5", "38;5"),
+        # not SGR.
+        ("target", "target"),
+        ("", ""),
+    ],
+)
+def test_normalize(color: str, expected: str) -> None:
+    assert normalize(color) == expected
+
+
+def test_normalize_reset() -> None:
+    assert normalize("00;01;34", keep_reset=False) == "1;34"
+    assert normalize("00", keep_reset=False) == "0"
+
+
+def test_minify() -> None:
+    colors, _ = parse("rs=0:di=00;01;34:ln=01;35:ex=01;032:*.tar=01;31:*.gz=1;31:*.tar=1;31")
+    assert minify(colors) == "ln=1;35:*.gz=1;31:*.tar=1;31"
+
+
+def test_minify_uncolored() -> None:
+    # `ls` takes these as unset; `mh=0;0` is colored, with a reset, and kept so.
+    colors, _ = parse("ca=00:mh=0:mi=:or=00:ln=01;36:*.gz=00")
+    assert minify(colors) == "or=0:*.gz=0"
+    colors, _ = parse("mh=0;0:mi=01;05;37;41")
+    assert minify(colors) == "mh=0;0:mi=1;5;37;41"
+
+
+def test_minify_normal() -> None:
+    # resets are not redundant when the normal text is colored.
+    colors, _ = parse("no=33:di=00;01;34:*.c=0;32")
+    assert minify(colors) == "no=33:di=0;1;34:*.c=0;32"
+
+
+def test_minify_default_database() -> None:
+    ls_colors = minify(default_database.COLORS)
+    colors, errors = parse(ls_colors)
+    assert not errors
+    assert len(ls_colors) < len(
+        ":".join([f"{x}={y}" for x, y in default_database.COLORS.items()])
+    )
+    assert colors[".tar"] == "1;31"
+    assert "di" not in colors
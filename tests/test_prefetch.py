@@ -0,0 +1,60 @@
+import random
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from lscolors.commands.utils.prefetch import Prefetcher
+
+
+def _slow(item: int) -> int:
+    time.sleep(random.uniform(0, 0.01))
+    return item * 2
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_order(workers: int) -> None:
+    with Prefetcher(workers) as prefetcher:
+        assert list(prefetcher.map(_slow, range(100))) == [x * 2 for x in range(100)]
+
+
+def test_concurrent() -> None:
+    # each call waits for three others; broken, failing the calls, unless all four overlap.
+    barrier = threading.Barrier(4)
+    with Prefetcher(4) as prefetcher:
+        results = prefetcher.map(lambda _: barrier.wait(timeout=10), range(8))
+        assert sorted(results) == [0, 0, 1, 1, 2, 2, 3, 3]
+
+
+def test_backpressure() -> None:
+    consumed = 0
+
+    def items() -> Iterator[int]:
+        nonlocal consumed
+        for i in range(1000):
+            consumed += 1
+            yield i
+
+    with Prefetcher(4, depth=10) as prefetcher:
+        results = prefetcher.map(_slow, items())
+        assert next(results) == 0
+        assert consumed <= 11
+
+
+def test_errors() -> None:
+    def fail(item: int) -> int:
+        if item == 3:
+            raise OSError(item)
+        return item
+
+    with Prefetcher(4) as prefetcher:
+        results = prefetcher.map(fail, range(10))
+        assert [next(results) for _ in range(3)] == [0, 1, 2]
+        with pytest.raises(OSError, match="3"):
+            next(results)
+
+    with pytest.raises(ValueError, match="workers 0"):
+        Prefetcher(0)
+    with pytest.raises(ValueError, match="queue depth 0"):
+        Prefetcher(2, depth=0)
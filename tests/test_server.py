@@ -0,0 +1,116 @@
+import asyncio
+import os
+import stat
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from lscolors.cli import main
+from lscolors.commands.utils import cache, shellenv
+from lscolors.commands.utils.server import Server, query, socket_path
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("TERM", "xterm")
+    monkeypatch.delenv("COLORTERM", raising=False)
+
+
+@pytest.fixture
+def dir_colors(tmp_path: Path) -> Path:
+    path = tmp_path / "DIR_COLORS"
+    path.write_text("TERM xterm\nDIR 01;34\nFILE 00\n*.gz 31\n*.tar.gz 32\n*README 33\n")
+    return path
+
+
+@pytest.fixture
+def daemon() -> Iterator[Server]:
+    server = Server(interval=0.01)
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(server.serve(socket_path(), stop),)
+    )
+    thread.start()
+    for _ in range(100):
+        if query("ping") is not None:
+            break
+        time.sleep(0.01)
+    yield server
+    loop.call_soon_threadsafe(stop.set)
+    thread.join()
+    loop.close()
+
+
+def test_answer(dir_colors: Path) -> None:
+    server = Server()
+    source = str(dir_colors)
+    assert server.answer("ping") == "ok"
+    assert (
+        server.answer(f"ls_colors\txterm\t\t{source}")
+        == "ok\tdi=01;34:fi=00:*.gz=31:*.tar.gz=32:*README=33:"
+    )
+    assert server.answer(f"color\txterm\t\tfoo.tar.gz\t{source}") == "ok\t32"
+    assert server.answer(f"color\txterm\t\tx.gz\t{source}") == "ok\t31"
+    assert server.answer(f"color\txterm\t\tx.txt\t{source}") == "ok\t00"
+    # not enabled for this terminal; empty, as `dircolors`.
+    assert server.answer(f"ls_colors\tdumb\t\t{source}") == "ok\t"
+    assert server.answer(f"ls_colors\txterm\t\t{source}.missing").startswith("error\t")
+    assert server.answer("color\txterm") == "error\tbad request 'color'"
+
+
+def test_check(dir_colors: Path) -> None:
+    server = Server()
+    assert server.answer(f"ls_colors\txterm\t\t{dir_colors}").endswith("*README=33:")
+    assert server.check() == []
+    dir_colors.write_text("TERM xterm\nDIR 01;35\n")
+    os.utime(dir_colors, ns=(0, 0))
+    assert server.check() == [(str(dir_colors),)]
+    assert len(server._databases) == 0
+    assert server.answer(f"ls_colors\txterm\t\t{dir_colors}") == "ok\tdi=01;35:"
+
+
+def test_changed_between_checks(dir_colors: Path) -> None:
+    server = Server()
+    assert server.answer(f"ls_colors\txterm\t\t{dir_colors}").endswith("*README=33:")
+    dir_colors.write_text("TERM xterm\nDIR 01;35\n")
+    os.utime(dir_colors, ns=(0, 0))
+    assert server.answer(f"ls_colors\txterm\t\t{dir_colors}") == "ok\tdi=01;35:"
+    assert server.answer(f"color\txterm\t\tx.gz\t{dir_colors}") == "ok\t"
+    assert server.check() == []
+
+
+def test_maxsize(dir_colors: Path) -> None:
+    server = Server(maxsize=2)
+    for term in ["xterm", "linux", "vt100", "xterm"]:
+        assert server.answer(f"ls_colors\t{term}\t\t{dir_colors}").startswith("ok\t")
+    assert len(server._databases) == 2
+    assert server._databases.evictions == 2
+
+
+def test_env_from_daemon(
+    capsys: pytest.CaptureFixture[str], daemon: Server, dir_colors: Path
+) -> None:
+    main(["env", "--shell", "sh", "--no-cache", str(dir_colors)])
+    local = capsys.readouterr().out
+    assert (
+        query("ls_colors", "xterm", "", str(dir_colors))
+        == "di=01;34:fi=00:*.gz=31:*.tar.gz=32:*README=33:"
+    )
+    main(["env", "--shell", "sh", str(dir_colors)])
+    assert capsys.readouterr().out == local
+    # the daemon's answer is not cached; it may predate the file stamped in the key.
+    key = shellenv.env_key([str(dir_colors)], "sh", "xterm", "")
+    assert key is not None
+    assert cache.get(key) is None
+    assert stat.S_IMODE(os.stat(socket_path()).st_mode) == 0o600
+    assert daemon.database([str(dir_colors)], "xterm", "")[1] in local
+
+
+def test_no_daemon(dir_colors: Path) -> None:
+    assert query("ping") is None
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from lscolors.cli import main
+from lscolors.commands.utils import default_database
+from lscolors.commands.utils.database import ColorDatabase
+from lscolors.commands.utils.shellenv import fast_main, format_env
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERM", "xterm")
+    monkeypatch.delenv("COLORTERM", raising=False)
+
+
+@pytest.mark.parametrize(
+    ("shell", "expected"),
+    [
+        ("bash", "LS_COLORS='di=01;34:*it'\\''s=1:*!=2:';\nexport LS_COLORS\n"),
+        ("fish", "set -gx LS_COLORS 'di=01;34:*it\\'s=1:*!=2:';\n"),
+        ("csh", "setenv LS_COLORS 'di=01;34:*it'\\''s=1:*\\!=2:'\n"),
+    ],
+)
+def test_format_env(shell: str, expected: str) -> None:
+    assert format_env(shell, "LS_COLORS", "di=01;34:*it's=1:*!=2:") == expected
+
+
+def test_env(capsys: pytest.CaptureFixture[str]) -> None:
+    main(["env", "--shell", "sh"])
+    output = capsys.readouterr().out
+    ls_colors = ColorDatabase(default_database.COLORS).to_ls_colors()
+    assert output == format_env("sh", "LS_COLORS", ls_colors)
+    # from the cache, for the same source, shell and terminal only.
+    assert fast_main(["env", "--shell=sh", default_database.NAME])
+    assert capsys.readouterr().out == output
+    assert not fast_main(["env", "--shell", "fish"])
+    assert not fast_main(["env", "--shell", "sh", "--term", "vt100"])
+    assert not fast_main(["env", "--shell", "sh", "--no-cache"])
+
+
+def test_env_dumb_term(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # no `TERM` block matches; empty, as `dircolors`.
+    monkeypatch.setenv("TERM", "dumb")
+    main(["env", "--shell", "sh"])
+    assert capsys.readouterr().out == "LS_COLORS='';\nexport LS_COLORS\n"
+    assert fast_main(["env", "--shell", "sh"])
+    assert capsys.readouterr().out == "LS_COLORS='';\nexport LS_COLORS\n"
+
+    monkeypatch.delenv("TERM")
+    main(["env", "--shell", "fish"])
+    assert capsys.readouterr().out == "set -gx LS_COLORS '';\n"
+
+
+def test_env_file(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    path = tmp_path / "DIR_COLORS"
+    path.write_text("TERM xterm\nDIR 01;34\n")
+    main(["env", "--shell", "csh", "--term", "xterm", str(path)])
+    assert capsys.readouterr().out == "setenv LS_COLORS 'di=01;34:'\n"
+    assert fast_main(["env", "--shell", "csh", str(path)])
+    assert capsys.readouterr().out == "setenv LS_COLORS 'di=01;34:'\n"
+
+    # stale when the file changes.
+    path.write_text("TERM xterm\nDIR 01;35\n")
+    os.utime(path, ns=(0, 0))
+    assert not fast_main(["env", "--shell", "csh", str(path)])
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from lscolors.cli import main
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERM", "dumb")
+
+
+def _install(capsys: pytest.CaptureFixture[str], *args: str) -> list[str]:
+    main(["install-snippets", *args])
+    return capsys.readouterr().out.splitlines()
+
+
+def test_install_snippets(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    path = tmp_path / "DIR_COLORS"
+    path.write_text("DIR 01;34\nTERM xterm\nTERM rxvt*\nEXEC 01;32\nTERM vt100\nFIFO 33\n")
+    snippets = tmp_path / "snippets"
+    args = [str(path), "--dir", str(snippets), "--shell", "bash", "fish", "--term", "linux"]
+
+    assert _install(capsys, *args) == [
+        str(snippets / x)
+        for x in ["xterm.sh", "xterm.fish", "vt100.sh", "vt100.fish", "linux.sh", "linux.fish"]
+    ]
+    assert (snippets / "xterm.sh").read_text() == (
+        "LS_COLORS='di=01;34:ex=01;32:';\nexport LS_COLORS\n"
+    )
+    assert (snippets / "vt100.fish").read_text() == "set -gx LS_COLORS 'di=01;34:pi=33:';\n"
+    assert (snippets / "linux.sh").read_text() == "LS_COLORS='di=01;34:';\nexport LS_COLORS\n"
+
+    # unchanged.
+    assert _install(capsys, *args) == []
+
+    # only the variants whose output changed.
+    path.write_text("DIR 01;34\nTERM xterm\nTERM rxvt*\nEXEC 01;32\nTERM vt100\nFIFO 35\n")
+    assert _install(capsys, *args) == [str(snippets / "vt100.sh"), str(snippets / "vt100.fish")]
+
+
+def test_install_snippets_dumb_term(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    snippets = tmp_path / "snippets"
+    args = ["builtin:default", "--dir", str(snippets), "--shell", "bash", "--term", "dumb"]
+    assert str(snippets / "dumb.sh") in _install(capsys, *args)
+    assert (snippets / "dumb.sh").read_text() == "LS_COLORS='';\nexport LS_COLORS\n"
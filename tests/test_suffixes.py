@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+
+from lscolors.cli import main
+from lscolors.commands.utils.database import ColorDatabase
+from lscolors.commands.utils.suffixes import (
+    Matcher,
+    SuffixTrie,
+    _literal,
+    case_rules,
+    case_variants,
+)
+
+
+def test_suffix_trie() -> None:
+    trie = SuffixTrie(
+        [(".gz", "", 1), (".tar.gz", "", 2), ("z", "", 3), ("README", "", 4), (".tgz", "", 5)]
+    )
+    assert trie.match("a.tar.gz") == 3
+    assert trie.match("a.tgz") == 5
+    assert trie.match("README") == 4
+    assert trie.match("xREADME") == 4
+    assert trie.match("EADME") is None
+    assert trie.match("A.TGZ") is None
+    assert trie.match("") is None
+    assert SuffixTrie([("z", "", 3), (".tar.gz", "", 2)]).match("a.tar.gz") == 2
+
+
+@pytest.mark.parametrize(
+    ("items", "expected"),
+    [
+        ([(".jpg", "31"), (".png", "31")], [True, True]),
+        # cases with different colors match exactly.
+        ([(".jpg", "31"), (".JPG", "32")], [False, False]),
+        # with the same color, the last defined ignores case.
+        ([(".jpg", "31"), (".JPG", "31")], [None, True]),
+        # ... and supersedes the other cases listed before it.
+        ([(".JPG", "32"), (".jpg", "31"), (".Jpg", "31")], [None, None, True]),
+        ([(".jpg", "31"), (".JPG", "32"), (".Jpg", "31")], [None, False, False]),
+    ],
+)
+def test_case_rules(items: list[tuple[str, str]], expected: list[bool | None]) -> None:
+    assert case_rules(items) == expected
+
+
+def test_ignore_case() -> None:
+    items = [(".jpg", "31", 1), (".JPG", "32", 2), (".gz", "33", 3), ("ZIP", "34", 4)]
+    trie = SuffixTrie(items, ignore_case=True)
+    assert [trie.match(x) for x in ["a.jpg", "a.JPG", "a.Jpg", "a.GZ", "a.zip"]] == [
+        1,
+        2,
+        None,
+        3,
+        4,
+    ]
+    assert case_variants([x[0] for x in items]) == [[".jpg", ".JPG"]]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("*README*", "README"),
+        ("*core.*ab", "core."),
+        ("*.[ch]", "."),
+        ("*[!]]x*", "x"),
+        ("*[]ab]cd", "cd"),
+        ("*[abc", "[abc"),
+        ("*?", ""),
+    ],
+)
+def test_literal(pattern: str, expected: str) -> None:
+    assert _literal(pattern) == expected
+
+
+def test_globs() -> None:
+    items = [("*README*", "", 1), (".gz", "", 2), ("*.[ch]", "", 3), ("*~", "", 4)]
+    matcher = Matcher(items, globs=True)
+    assert [matcher.match(x) for x in ["README.md", "README.gz", "a.c", "a.c~", "a.o"]] == [
+        1,
+        2,
+        3,
+        4,
+        None,
+    ]
+    # as `ls`, literally.
+    matcher = Matcher(items)
+    assert [matcher.match(x) for x in ["README.md", "xREADME*", "a.c", "a.[ch]"]] == [
+        None,
+        1,
+        None,
+        3,
+    ]
+
+
+def test_database_match() -> None:
+    colors = ColorDatabase({"di": "01;34", ".gz": "31", "*.tar.gz": "32", "*~": "33"})
+    assert colors.match("a.tar.gz") == colors.entry("*.tar.gz")
+    assert colors.match("a.gz") == colors.entry(".gz")
+    assert colors.match("a~") == colors.entry("*~")
+    assert colors.match("di") is None
+    assert colors.match("A.GZ") is None
+    assert colors.match("A.GZ", ignore_case=True) == colors.entry(".gz")
+    colors = ColorDatabase({"*README*": "31"})
+    assert colors.match("README.md", globs=True) == colors.entry("*README*")
+
+
+def test_check_ignore_case(
+    capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".lscolors.yml").write_text(
+        "required_filenames: []\nrequired_directories: []\nrequired_extensions: [.Png]\n"
+    )
+    (tmp_path / "DIR_COLORS").write_text(".jpg 31\n.JPG 32\n.png 35\n.PNG 35\n")
+
+    with pytest.raises(SystemExit):
+        main(["check", "DIR_COLORS"])
+    captured = capsys.readouterr()
+    assert "missing ['.Png']" in captured.err
+    # variants are listed only when asked for.
+    assert not captured.out
+    with pytest.raises(SystemExit):
+        main(["-v", "check", "DIR_COLORS"])
+    assert "check: case variants; .jpg=31" in capsys.readouterr().out
+    main(["check", "--ignore-case", "DIR_COLORS"])
+    assert capsys.readouterr().out.splitlines()[-4:-1] == [
+        "check: case variants; .jpg=31 (exact case), .JPG=32 (exact case)",
+        "check: case variants; .png=35 (superseded), .PNG=35 (any case)",
+        "check: success; 4 items; 1/1 required.",
+    ]
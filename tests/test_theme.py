@@ -0,0 +1,110 @@
+import sys
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from lscolors.commands.utils import colors as colors_utils
+from lscolors.commands.utils import theme
+
+FILETYPES = """
+core:
+  directory: $di
+  executable_file: $ex
+text:
+  special: [CHANGELOG, README.md]
+  other: [.txt, .md]
+archives: [.tar]
+"""
+
+THEME = """
+colors:
+  green: "a6e22e"
+  pink: "F92672"
+core:
+  directory:
+    foreground: "66d9ef"
+    font-style: bold
+  executable_file: {}
+text:
+  foreground: green
+  special:
+    background: pink
+    font-style: [bold, underline]
+"""
+
+
+@pytest.fixture(autouse=True)
+def _environ(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+
+@pytest.fixture(name="theme_file")
+def _theme_file(tmp_path: Path) -> str:
+    (tmp_path / "themes").mkdir()
+    (tmp_path / "filetypes.yml").write_text(FILETYPES)
+    path = tmp_path / "themes" / "theme.yml"
+    path.write_text(THEME)
+    return str(path)
+
+
+def _options(theme_file: str, *dir_colors: str, no_cache: bool = False) -> Namespace:
+    return Namespace(
+        dir_colors=list(dir_colors),
+        theme=theme_file,
+        filetypes=None,
+        no_cache=no_cache,
+        lenient=False,
+        prog="test",
+    )
+
+
+def test_load(theme_file: str) -> None:
+    colors, meta = colors_utils.load(_options(theme_file))
+    assert dict(colors) == {
+        "di": "1;38;2;102;217;239",
+        "ex": "0",
+        "*CHANGELOG": "1;4;38;2;166;226;46;48;2;249;38;114",
+        "*README.md": "1;4;38;2;166;226;46;48;2;249;38;114",
+        ".txt": "38;2;166;226;46",
+        ".md": "38;2;166;226;46",
+    }
+    assert meta == f"dir_colors={'theme:' + theme_file!r}"
+    entry = colors.entry(".txt")
+    assert entry
+    assert entry.comment == "# text.other"
+
+
+def test_load_layers(theme_file: str, tmp_path: Path) -> None:
+    path = tmp_path / "DIR_COLORS"
+    path.write_text(".txt 01;31\n")
+    colors, _ = colors_utils.load(_options(theme_file, str(path)))
+    assert colors[".txt"] == "01;31"
+    assert colors["di"] == "1;38;2;102;217;239"
+
+
+def test_cache(theme_file: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    theme.load(theme_file, theme.find_filetypes(theme_file))
+    # cached; YAML is not needed again.
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    colors, lines = theme.load(theme_file, theme.find_filetypes(theme_file))
+    assert colors["di"] == "1;38;2;102;217;239"
+    assert lines["di"] == (0, "# core.directory")
+    with pytest.raises(ImportError):
+        theme.load(theme_file, theme.find_filetypes(theme_file), no_cache=True)
+
+
+def test_errors(theme_file: str, tmp_path: Path) -> None:
+    Path(theme_file).write_text("core:\n  directory:\n    foreground: purple\n")
+    with pytest.raises(RuntimeError, match="unknown color 'purple' in core.directory"):
+        colors_utils.load(_options(theme_file, no_cache=True))
+
+    # valid YAML, but not a filetype name.
+    (tmp_path / "filetypes.yml").write_text("core:\n  directory:\n    - [a, b]\n")
+    with pytest.raises(RuntimeError, match=r"names in core.directory, not \['a', 'b'\]"):
+        colors_utils.load(_options(theme_file, no_cache=True))
+
+    (tmp_path / "filetypes.yml").unlink()
+    with pytest.raises(RuntimeError, match="no `filetypes.yml`"):
+        colors_utils.load(_options(theme_file))